@@ -6,6 +6,7 @@ Azure best practices implementation for monitoring and logging
 import logging
 import time
 import functools
+import os
 from typing import Callable, Any
 from fastapi import Request, HTTPException
 import json
@@ -88,7 +89,11 @@ def validate_github_url(url: str) -> bool:
     """
     if not url:
         return False
-    
+
+    # Local file:// repos are only accepted when explicitly enabled (benchmarks)
+    if url.startswith("file://"):
+        return os.getenv("GITREADME_ALLOW_LOCAL_REPOS", "").lower() in ("1", "true", "yes")
+
     # Basic GitHub URL validation
     valid_patterns = [
         "https://github.com/",
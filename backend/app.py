@@ -1,6 +1,11 @@
 from gitreadme_brain import GitReadmeBrain   # ✅ renamed
 from helpers import Helper
 from generators import Generators
+from planner import GenerationPlanner, BudgetExceededError
+from summary_tree import HierarchicalSummarizer
+from checkpoints import JobCheckpoint
+from corpus import CorpusStore
+from langchain_community.vectorstores import FAISS
 import os
 
 class ReadmeGeneratorApp:
@@ -12,49 +17,129 @@ class ReadmeGeneratorApp:
     - LLM summarization
     - README generation
     - Optional vectorstore examples
+    - Optional per-section generation over a code vector index
+    - Up-front cost planning / budget checks
+    - Per-stage checkpoints so retries resume
     """
 
+    GENERATION_METHODS = ("Standard README", "README with Examples", "README with Code Retrieval")
+
     def __init__(self):
         # Core engine components
         self.brain = GitReadmeBrain()          # ✅ uses OpenAI now
         self.helper = Helper()
         self.generator = Generators()
+        self.planner = GenerationPlanner()
 
         # Initialize LLM + embeddings
         self.llm = self.brain.getLLM()
         self.embeddings = self.brain.getEmbeddingModel()
 
+        # "map_reduce" (flat, default) or "hierarchical" (per-directory, cached by git tree hash)
+        # Cached summaries are namespaced by provider + model so they are never shared across them
+        self.summarizer = os.getenv("GITREADME_SUMMARIZER", "map_reduce").lower()
+        self.hierarchical = HierarchicalSummarizer(
+            provider=self.brain.provider_name,
+            model=getattr(self.brain.provider, "model", "")
+        ) if self.summarizer == "hierarchical" else None
+
     def generate_readme_from_repo_url(self, github_url: str, generator_method: str = "Standard README"):
         """
         Main function to create a README for a GitHub repo.
         Download repo → Parse code → Summarize → Generate README
+
+        Each stage checkpoints into the job workspace; if a call fails, retrying
+        the same URL + method resumes from the last completed stage.
         """
 
-        # Extract repo name from URL
-        repo_name = github_url.rstrip('/').split('/')[-1]
+        if generator_method not in self.GENERATION_METHODS:
+            raise ValueError(f"Unknown generator method: {generator_method}")
 
-        # Clone repo
-        local_path = self.helper.clone_repo(github_url, repo_name)
+        with self._open_job(github_url, generator_method) as job:
+            return self._run_job(job, github_url, generator_method)
 
-        # Extract code
-        code_text = self.helper.extract_code_from_repo(local_path)
+    def _open_job(self, github_url: str, generator_method: str) -> JobCheckpoint:
+        """
+        Workspace for this URL + method, held exclusively until the job ends
+        (a concurrent identical request waits for it, up to
+        GITREADME_JOB_LOCK_TIMEOUT, then resumes). Expired workspaces of failed
+        jobs and dry runs nobody followed up on are swept first.
+        """
+        JobCheckpoint.sweep_expired(Helper.PROJECTS_DIR)
+        return JobCheckpoint(
+            JobCheckpoint.job_id_for(github_url, generator_method, self.summarizer),
+            root=Helper.PROJECTS_DIR
+        )
 
-        # Summarize project codebase
-        summary = self.generator.summarize_code(self.llm, code_text)
+    def _run_job(self, job: JobCheckpoint, github_url: str, generator_method: str) -> str:
+        """Run (or resume) every stage of one generation job in its workspace."""
+        if job.resumed_stages:
+            print(f"♻️ Resuming job {job.job_id} after: {', '.join(job.resumed_stages)}")
+        # A dry run's workspace now belongs to a real job; keep it for the normal TTL
+        if job.state.get("plan_only"):
+            job.mark_plan_only(False)
 
-        # Choose README generation method
-        if generator_method == "Standard README":
-            readme_content = self.generator.generate_readme(self.llm, summary)
+        local_path, corpus = self._clone_and_extract(job, github_url)
 
-        elif generator_method == "README with Examples":
-            readme_content = self.generator.generate_readme_with_examples_vectorstore(
-                self.llm,
-                self.embeddings,
-                summary
-            )
+        # Check the plan against the budget before spending any LLM calls
+        try:
+            corpus, plan = self.planner.enforce_corpus(corpus, generator_method)
+        except BudgetExceededError:
+            corpus.close()
+            job.clear()
+            raise
+        # Retrieval generation writes sections straight from the code; no repo-wide summary
+        needs_summary = generator_method != "README with Code Retrieval"
 
-        else:
-            raise ValueError(f"Unknown generator method: {generator_method}")
+        # The hierarchical summarizer has its own call count; it only runs when that fits too
+        use_hierarchical = False
+        if self.hierarchical and needs_summary and not job.is_done("reduce"):
+            plan, use_hierarchical = self._plan_hierarchical(plan, local_path)
+        print(f"📐 Plan: {plan['chunks']} chunks, {plan['llm_calls']} LLM calls, "
+              f"~{plan['estimated_latency_seconds']}s")
+
+        # Summarize project codebase (map results are checkpointed per chunk)
+        try:
+            if not needs_summary:
+                summary = None
+            elif job.is_done("reduce"):
+                summary = job.load_text("summary.txt")
+            else:
+                if use_hierarchical:
+                    summary = self.hierarchical.summarize_repo(self.llm, local_path)
+                else:
+                    summary = self.generator.summarize_corpus(self.llm, corpus, checkpoint=job)
+                job.save_text("summary.txt", summary)
+                job.mark_done("reduce")
+
+            # Choose README generation method
+            if job.is_done("final"):
+                readme_content = job.load_text("readme.md")
+
+            elif generator_method == "Standard README":
+                readme_content = self.generator.generate_readme(self.llm, summary)
+
+            elif generator_method == "README with Examples":
+                readme_content = self.generator.generate_readme_with_examples_vectorstore(
+                    self.llm,
+                    self.embeddings,
+                    summary,
+                    language=self.helper.detect_language(corpus)
+                )
+
+            else:
+                readme_content = self.generator.generate_readme_with_code_retrieval(
+                    self.llm,
+                    self.embeddings,
+                    corpus,
+                    self._code_index(job, corpus),
+                    repo_root=local_path
+                )
+        finally:
+            corpus.close()
+
+        job.save_text("readme.md", readme_content)
+        job.mark_done("final")
 
         # Save generated README inside repo folder
         output_path = os.path.join(local_path, "GENERATED_README.md")
@@ -66,11 +151,107 @@ class ReadmeGeneratorApp:
         print("-" * 60)
         print(readme_content[:1000])  # Show preview in console
 
-        # Cleanup the repo folder
-        cleanup_success = self.helper.delete_cloned_repo(local_path)
-        if cleanup_success:
+        # Cleanup the job workspace (clone + checkpoints)
+        job.clear()
+        if not os.path.exists(job.dir):
             print("🧹 Cleanup completed successfully")
         else:
             print("⚠️ Warning: Could not clean up temporary files")
 
         return readme_content
+
+    def plan_readme_from_repo_url(self, github_url: str, generator_method: str = "Standard README") -> dict:
+        """
+        Dry run: clone and extract the repo, then return the predicted chunks,
+        LLM calls, tokens and latency without calling the LLM.
+
+        Runs the clone and extract stages of the real job, so the plan is made
+        on the same corpus and a following /generate-readme resumes from them.
+        If none follows within GITREADME_PLAN_TTL_MINUTES, the workspace is
+        swept (as are the oldest beyond GITREADME_MAX_PLAN_WORKSPACES).
+        """
+        if generator_method not in self.GENERATION_METHODS:
+            raise ValueError(f"Unknown generator method: {generator_method}")
+
+        with self._open_job(github_url, generator_method) as job:
+            # Only flag workspaces the dry run created, not a failed generation's
+            if not set(job.resumed_stages) - {"clone", "extract"}:
+                job.mark_plan_only()
+            local_path, corpus = self._clone_and_extract(job, github_url)
+            try:
+                plan = self.planner.plan(corpus.text_length, generator_method, chunks=len(corpus))
+                needs_summary = generator_method != "README with Code Retrieval"
+                if self.hierarchical and needs_summary and not plan["violations"]:
+                    plan, _ = self._plan_hierarchical(plan, local_path)
+                plan["files"] = corpus.file_count
+
+                if plan["violations"]:
+                    try:
+                        _, degraded = self.planner.enforce_corpus(corpus, generator_method)
+                        plan["action"] = "degrade"
+                        plan["degraded_plan"] = degraded
+                    except BudgetExceededError:
+                        plan["action"] = "reject"
+                else:
+                    plan["action"] = "accept"
+
+                return plan
+
+            finally:
+                corpus.close()
+
+    def _clone_and_extract(self, job: JobCheckpoint, github_url: str):
+        """Clone and extract stages of a job; returns (clone path, corpus)."""
+        # Clone repo (a half-finished clone from a failed attempt is discarded)
+        local_path = job.path("repo")
+        if not job.is_done("clone"):
+            if os.path.exists(local_path):
+                self.helper.delete_cloned_repo(local_path)
+            self.helper.clone_repo(github_url, os.path.join(job.job_id, "repo"))
+            job.mark_done("clone")
+
+        # Extract code into a memory-mapped corpus in the job workspace
+        if job.is_done("extract"):
+            corpus = CorpusStore.open(job.path("corpus"))
+        else:
+            corpus = self._extract_corpus(local_path, job.path("corpus"))
+            job.mark_done("extract")
+        return local_path, corpus
+
+    def _plan_hierarchical(self, plan: dict, local_path: str):
+        """
+        Return (plan, use_hierarchical). Falls back to the corpus map-reduce plan
+        when the input was trimmed (trimming only applies to the corpus) or the
+        hierarchical call count is over budget.
+        """
+        if plan["degraded"]:
+            return plan, False
+
+        hierarchical_plan = self.planner.plan_hierarchical(plan, self.hierarchical, local_path)
+        if hierarchical_plan["violations"]:
+            print(f"⚠️ Hierarchical summary over budget ({'; '.join(hierarchical_plan['violations'])}) "
+                  f"→ using map-reduce")
+            return plan, False
+        return hierarchical_plan, True
+
+    def _code_index(self, job: JobCheckpoint, corpus):
+        """Per-repo FAISS code index, saved in the job workspace so retries skip re-embedding."""
+        index_path = job.path("code_index")
+        if job.is_done("index"):
+            # Written by this job in its own workspace, so loading the pickle is safe
+            return FAISS.load_local(index_path, self.embeddings, allow_dangerous_deserialization=True)
+
+        code_index = self.generator.build_code_index(self.embeddings, corpus)
+        if code_index is not None:
+            code_index.save_local(index_path)
+            job.mark_done("index")
+        return code_index
+
+    def _extract_corpus(self, local_path: str, corpus_path: str):
+        """Build the corpus outside the clone, so it is never walked as repo content."""
+        return self.helper.extract_corpus_from_repo(
+            local_path,
+            corpus_path,
+            Generators.CHUNK_SIZE,
+            Generators.CHUNK_OVERLAP
+        )
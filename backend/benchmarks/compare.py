@@ -0,0 +1,137 @@
+"""
+Benchmark regression gate.
+
+    python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 0.25]
+    python -m benchmarks.compare --errors-only CURRENT.json
+
+Exits with status 1 when any gated metric is worse than the baseline by more
+than the threshold (see metric naming in run.py), when a baseline benchmark is
+missing from the current run, or when any `errors` count in the current run is
+above zero. Error counts are checked on their own, with or without a baseline:
+a pipeline that fails fast also looks fast.
+"""
+
+import argparse
+import json
+import sys
+
+
+def direction(metric: str):
+    """+1 if higher is better, -1 if lower is better, None if not gated."""
+    if metric.endswith("_per_s"):
+        return 1
+    if metric.endswith(("_s", "_ms", "_mb")):
+        return -1
+    return None
+
+
+def is_error_count(metric: str) -> bool:
+    return metric == "errors" or metric.endswith("_errors")
+
+
+def hard_failures(baseline: dict, current: dict) -> list:
+    """Problems that fail the gate regardless of threshold: errors and missing benchmarks."""
+    failures = []
+    for bench, metrics in sorted(current.get("results", {}).items()):
+        for metric, value in sorted(metrics.items()):
+            if is_error_count(metric) and value:
+                failures.append(f"{bench}: {metric} = {value}")
+    for bench in sorted(baseline.get("results", {})):
+        if bench not in current.get("results", {}):
+            failures.append(f"{bench}: missing from current run")
+    return failures
+
+
+def to_ms(metric: str, value: float) -> float:
+    return value * 1000 if metric.endswith("_s") and not metric.endswith("_per_s") else value
+
+
+def is_regression(metric: str, old: float, new: float, options) -> bool:
+    """
+    Per-unit rules:
+      time (*_s, *_ms)  above the noise floor: slower by more than `threshold`;
+                        below it (a few ms, noisy): slower by more than
+                        `tiny_threshold` AND by more than `min_delta_ms`
+      memory (*_mb)     grew by more than `threshold` AND by more than `noise_floor_mb`
+      rate (*_per_s)    dropped by more than `threshold`
+    """
+    change = (new - old) / old
+    if metric.endswith("_per_s"):
+        return -change > options.threshold
+    if metric.endswith("_mb"):
+        return change > options.threshold and new - old > options.noise_floor_mb
+
+    old_ms, new_ms = to_ms(metric, old), to_ms(metric, new)
+    if old_ms >= options.noise_floor_ms:
+        return change > options.threshold
+    return change > options.tiny_threshold and new_ms - old_ms > options.min_delta_ms
+
+
+def compare(baseline: dict, current: dict, options) -> list:
+    """Return a list of (bench, metric, old, new, change, regressed) rows."""
+    rows = []
+    for bench, old_metrics in sorted(baseline.get("results", {}).items()):
+        new_metrics = current.get("results", {}).get(bench)
+        if new_metrics is None:
+            continue
+
+        for metric, old in sorted(old_metrics.items()):
+            new = new_metrics.get(metric)
+            if direction(metric) is None or new is None or not old:
+                continue
+            change = (new - old) / old
+            rows.append((bench, metric, old, new, change, is_regression(metric, old, new, options)))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline", nargs="?")
+    parser.add_argument("current")
+    parser.add_argument("--errors-only", action="store_true",
+                        help="only check CURRENT for errors (no baseline yet)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument("--noise-floor-ms", type=float, default=50.0,
+                        help="baseline timings below this use the tiny-latency rule")
+    parser.add_argument("--tiny-threshold", type=float, default=1.0,
+                        help="allowed relative slowdown for timings under the noise floor (1.0 = 2x)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="timings under the noise floor must also slow down by this much")
+    parser.add_argument("--noise-floor-mb", type=float, default=0.05,
+                        help="peak memory must also grow by this many MB")
+    args = parser.parse_args(argv)
+
+    if not args.errors_only and not args.baseline:
+        parser.error("BASELINE is required unless --errors-only is given")
+
+    baseline = {}
+    if not args.errors_only:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args)
+    errors = hard_failures(baseline, current)
+
+    failures = 0
+    for bench, metric, old, new, change, regressed in rows:
+        mark = "❌" if regressed else "✅"
+        failures += regressed
+        print(f"{mark} {bench:<28} {metric:<18} {old:>12.4f} → {new:>12.4f} ({change:+.1%})")
+
+    for error in errors:
+        print(f"❌ {error}")
+
+    if failures or errors:
+        print(f"\n❌ {failures} metric(s) regressed more than {args.threshold:.0%}, "
+              f"{len(errors)} hard failure(s)")
+        return 1
+
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
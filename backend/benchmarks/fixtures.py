@@ -0,0 +1,95 @@
+"""
+Synthetic repository fixtures for the GitReadme benchmarks.
+Everything is generated from a seed, so runs are comparable across machines.
+"""
+
+import os
+import random
+
+from git import Actor, Repo
+
+# name -> (files, approx lines per file)
+TREE_SIZES = {
+    "small": (50, 40),
+    "medium": (400, 60),
+    "large": (2000, 80),
+}
+
+_EXTENSIONS = [".py", ".js", ".ts", ".go", ".md", ".json", ".yaml"]
+_WORDS = [
+    "config", "request", "handler", "parser", "cache", "client", "token",
+    "index", "summary", "worker", "queue", "router", "schema", "session",
+    "vector", "chunk", "stream", "buffer", "render", "model", "repo",
+]
+
+
+def _file_body(rng: random.Random, ext: str, lines: int) -> str:
+    if ext == ".md":
+        out = [f"# {rng.choice(_WORDS).title()} {rng.choice(_WORDS)}", ""]
+        out += [" ".join(rng.choice(_WORDS) for _ in range(12)) for _ in range(lines - 2)]
+        return "\n".join(out) + "\n"
+    if ext in (".json", ".yaml"):
+        return "\n".join(f"{rng.choice(_WORDS)}_{i}: {rng.randint(0, 9999)}" for i in range(lines)) + "\n"
+
+    out = []
+    while len(out) < lines:
+        name = f"{rng.choice(_WORDS)}_{rng.choice(_WORDS)}_{rng.randint(0, 999)}"
+        args = ", ".join(rng.sample(_WORDS, 2))
+        if ext == ".py":
+            out += [f"def {name}({args}):", f"    return {args.replace(', ', ' + ')}", ""]
+        else:
+            out += [f"function {name}({args}) {{", f"  return {args.replace(', ', ' + ')};", "}", ""]
+    return "\n".join(out[:lines]) + "\n"
+
+
+def make_tree(root: str, files: int, lines: int, seed: int = 0) -> str:
+    """Write `files` synthetic source files under `root` in nested folders."""
+    rng = random.Random(seed)
+    for i in range(files):
+        depth = rng.randint(0, 3)
+        folder = os.path.join(root, *(f"{rng.choice(_WORDS)}" for _ in range(depth)))
+        os.makedirs(folder, exist_ok=True)
+        ext = rng.choice(_EXTENSIONS)
+        with open(os.path.join(folder, f"file_{i}{ext}"), "w", encoding="utf-8") as f:
+            f.write(_file_body(rng, ext, lines))
+    return root
+
+
+def make_git_repo(root: str, files: int, lines: int, seed: int = 0) -> str:
+    """Create a synthetic tree and commit it, returning a file:// URL."""
+    make_tree(root, files, lines, seed)
+    repo = Repo.init(root)
+    repo.git.add(A=True)
+    author = Actor("GitReadme Bench", "bench@gitreadme.local")
+    repo.index.commit("fixture", author=author, committer=author)
+    return "file://" + os.path.abspath(root)
+
+
+def make_example_docs(count: int, seed: int = 0) -> list:
+    """Synthetic example README texts for retrieval benchmarks."""
+    rng = random.Random(seed)
+    docs = []
+    for i in range(count):
+        sections = []
+        for heading in ("Features", "Installation", "Usage", "Configuration"):
+            body = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(30, 120)))
+            sections.append(f"## {heading}\n\n{body}")
+        docs.append(f"# Project {i}\n\n" + "\n\n".join(sections))
+    return docs
+
+
+EXAMPLE_LANGUAGES = ["python", "javascript", "typescript", "go", "rust", "java", "any"]
+EXAMPLE_PROJECT_TYPES = ["cli", "library", "web", "service"]
+
+
+def make_example_tree(root: str, count: int, seed: int = 0) -> str:
+    """Write `count` tagged example READMEs as examples/<language>/<project_type>/*.md."""
+    rng = random.Random(seed)
+    for i, text in enumerate(make_example_docs(count, seed)):
+        language = rng.choice(EXAMPLE_LANGUAGES)
+        project_type = rng.choice(EXAMPLE_PROJECT_TYPES)
+        folder = root if language == "any" else os.path.join(root, language, project_type)
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"example_{i}.md"), "w", encoding="utf-8") as f:
+            f.write(text)
+    return root
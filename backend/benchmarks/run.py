@@ -0,0 +1,321 @@
+"""
+GitReadme benchmark suite.
+
+Runs fully offline: the LLM is the deterministic "fake" provider and repos are
+local file:// git fixtures. Run from the backend folder:
+
+    python -m benchmarks.run --out benchmarks/results/latest.json
+    python -m benchmarks.compare benchmarks/baseline.json benchmarks/results/latest.json
+
+Metric naming drives the regression gate in compare.py:
+    *_s / *_ms   lower is better
+    *_mb         lower is better (peak memory)
+    *_per_s      higher is better
+    errors       must be zero
+    anything else is informational
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fixtures import (
+    TREE_SIZES, make_tree, make_git_repo, make_example_docs, make_example_tree
+)
+
+QUICK_SIZES = ["small", "medium"]
+FULL_SIZES = ["small", "medium", "large"]
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def timed(fn, repeat: int):
+    """Run `fn` `repeat` times; return (median seconds, last result)."""
+    durations, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations), result
+
+
+# ------------------------------------------------------------
+# Extraction into the memory-mapped corpus (+ peak Python memory)
+# ------------------------------------------------------------
+def traced_peak_mb(fn):
+    """Run `fn` once under tracemalloc; return (peak MB allocated, result)."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024), result
+
+
+def bench_extract_corpus(workdir: str, sizes: list, repeat: int, seed: int) -> dict:
+    from helpers import Helper
+    from generators import Generators
+    from corpus import CorpusStore
+
+    helper = Helper()
+    window = int(os.getenv("GITREADME_MAP_WINDOW", "32"))
+
+    def build(root, path):
+        corpus = helper.extract_corpus_from_repo(
+            root, path, Generators.CHUNK_SIZE, Generators.CHUNK_OVERLAP
+        )
+        corpus.close()
+        return corpus
+
+    def read_windows(path):
+        # What the map step holds at once: one window of chunk texts
+        corpus = CorpusStore.open(path)
+        try:
+            for offset in range(0, len(corpus), window):
+                texts = [corpus.chunk(i).page_content
+                         for i in range(offset, min(offset + window, len(corpus)))]
+            return len(corpus)
+        finally:
+            corpus.close()
+
+    results = {}
+    for size in sizes:
+        files, lines = TREE_SIZES[size]
+        root = make_tree(os.path.join(workdir, "trees", size), files, lines, seed)
+        path = os.path.join(workdir, f"corpus_{size}")
+
+        # Timings and memory are measured in separate runs; tracemalloc slows allocation
+        extract_s, corpus = timed(lambda: build(root, path), repeat)
+        read_s, chunks = timed(lambda: read_windows(path), repeat)
+        build_peak_mb, _ = traced_peak_mb(lambda: build(root, path))
+        read_peak_mb, _ = traced_peak_mb(lambda: read_windows(path))
+
+        mb = corpus.text_length / (1024 * 1024)
+        results[f"extract.{size}"] = {
+            "files": corpus.file_count,
+            "chunks": chunks,
+            "megabytes": round(mb, 3),
+            "median_s": round(extract_s, 5),
+            "peak_mb": round(build_peak_mb, 3),
+        }
+        results[f"corpus_read.{size}"] = {
+            "window": window,
+            "median_s": round(read_s, 5),
+            "peak_mb": round(read_peak_mb, 3),
+        }
+        print(f"  extract {size}: {extract_s:.3f}s, {chunks} chunks, peak {build_peak_mb:.2f}MB; "
+              f"windowed read {read_s:.3f}s, peak {read_peak_mb:.2f}MB")
+    return results
+
+
+# ------------------------------------------------------------
+# Examples corpus: partitioned ANN index, section-level retrieval
+# ------------------------------------------------------------
+def bench_examples_index(workdir: str, doc_counts: list, queries: int, seed: int) -> dict:
+    from examples_index import ExamplesIndex
+    from llm_providers import HashedEmbeddings
+
+    embeddings = HashedEmbeddings(dim=int(os.getenv("FAKE_EMBED_DIM", "256")))
+    query_vectors = embeddings.embed_documents(make_example_docs(queries, seed=seed + 1))
+
+    results = {}
+    for count in doc_counts:
+        root = make_example_tree(os.path.join(workdir, f"examples_{count}"), count, seed)
+
+        start = time.perf_counter()
+        documents = ExamplesIndex.read_directory(root)
+        read_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = ExamplesIndex.build(documents, embeddings)
+        build_s = time.perf_counter() - start
+
+        saved = os.path.join(workdir, f"examples_index_{count}")
+        index.save(saved)
+        start = time.perf_counter()
+        index = ExamplesIndex.load(saved)
+        load_s = time.perf_counter() - start
+
+        unfiltered, filtered = [], []
+        for i, vector in enumerate(query_vectors):
+            start = time.perf_counter()
+            index.search(vector, k=6)
+            unfiltered.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            index.search(vector, k=6, language=["python", "go", "rust"][i % 3], project_type="cli")
+            filtered.append((time.perf_counter() - start) * 1000)
+
+        results[f"examples_index.{count}"] = {
+            "documents": count,
+            "sections": len(index),
+            "read_s": round(read_s, 4),
+            "build_s": round(build_s, 4),
+            "load_s": round(load_s, 4),
+            "vectors_mb": round(sum(
+                part.ntotal * part.d * 4 for part, _ in index.partitions.values()
+            ) / 1e6, 3),
+            "query_p50_ms": round(percentile(unfiltered, 50), 3),
+            "query_p95_ms": round(percentile(unfiltered, 95), 3),
+            "filtered_query_p50_ms": round(percentile(filtered, 50), 3),
+            "filtered_query_p95_ms": round(percentile(filtered, 95), 3),
+        }
+        print(f"  examples index {count} docs / {len(index)} sections: build {build_s:.2f}s, "
+              f"p95 {percentile(unfiltered, 95):.2f}ms, filtered p95 {percentile(filtered, 95):.2f}ms")
+    return results
+
+
+# ------------------------------------------------------------
+# /generate-readme under concurrent load
+# ------------------------------------------------------------
+def bench_endpoint(workdir: str, size: str, requests: int, concurrency: int, seed: int) -> dict:
+    import httpx
+
+    files, lines = TREE_SIZES[size]
+    fixture = os.path.join(workdir, "fixtures", f"repo_{size}")
+    make_git_repo(fixture, files, lines, seed)
+
+    # One symlinked URL per request, so concurrent clones never share a folder
+    urls = []
+    for i in range(requests):
+        link = f"{fixture}__r{i}"
+        os.symlink(fixture, link)
+        urls.append("file://" + link)
+
+    # Clones land in ./projects, keep them inside the temp workspace
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import fastapi_app
+
+        async def one(client, semaphore, url):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/generate-readme",
+                    json={"repo_url": url, "generation_method": "Standard README"}
+                )
+                elapsed = (time.perf_counter() - start) * 1000
+                ok = response.status_code == 200 and response.json().get("success")
+                return elapsed, bool(ok)
+
+        async def run_all():
+            semaphore = asyncio.Semaphore(concurrency)
+            transport = httpx.ASGITransport(app=fastapi_app.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                         timeout=None) as client:
+                start = time.perf_counter()
+                outcomes = await asyncio.gather(*(one(client, semaphore, u) for u in urls))
+                return time.perf_counter() - start, outcomes
+
+        # The pipeline prints previews for every request; keep benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            wall_s, outcomes = asyncio.run(run_all())
+    finally:
+        os.chdir(previous_cwd)
+
+    latencies = [elapsed for elapsed, _ in outcomes]
+    errors = sum(1 for _, ok in outcomes if not ok)
+    result = {
+        "repo_size": size,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_s": round(wall_s, 4),
+        "throughput_per_s": round(requests / wall_s, 3) if wall_s else 0.0,
+        "latency_p50_ms": round(percentile(latencies, 50), 2),
+        "latency_p95_ms": round(percentile(latencies, 95), 2),
+        "latency_p99_ms": round(percentile(latencies, 99), 2),
+    }
+    print(f"  endpoint {size} x{requests} @c{concurrency}: "
+          f"{result['throughput_per_s']} req/s, p95 {result['latency_p95_ms']}ms, {errors} errors")
+    return {f"endpoint.{size}.c{concurrency}": result}
+
+
+# ------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------
+def _git_commit() -> str:
+    try:
+        from git import Repo
+        return Repo(search_parent_directories=True).head.commit.hexsha
+    except Exception:
+        return "unknown"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="GitReadme benchmark suite")
+    parser.add_argument("--out", default="benchmarks/results/latest.json")
+    parser.add_argument("--quick", action="store_true", help="smaller trees and fewer requests")
+    parser.add_argument("--only", default="extract,examples,endpoint",
+                        help="comma list of: extract, examples, endpoint")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Offline configuration; explicit env vars still win
+    os.environ.setdefault("LLM_PROVIDER", "fake")
+    os.environ.setdefault("FAKE_LLM_LATENCY_MS", "20")
+    os.environ.setdefault("FAKE_LLM_LATENCY_JITTER_MS", "10")
+    os.environ.setdefault("FAKE_LLM_LATENCY_DIST", "lognormal")
+    os.environ.setdefault("FAKE_LLM_SEED", str(args.seed))
+    os.environ["GITREADME_ALLOW_LOCAL_REPOS"] = "1"
+
+    only = {name.strip() for name in args.only.split(",") if name.strip()}
+    sizes = QUICK_SIZES if args.quick else FULL_SIZES
+    requests = args.requests or (16 if args.quick else 64)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="gitreadme-bench-") as workdir:
+        if "extract" in only:
+            print("▶ corpus extraction + windowed reads")
+            results.update(bench_extract_corpus(workdir, sizes, args.repeat, args.seed))
+        if "examples" in only:
+            print("▶ examples ANN index")
+            counts = [1000, 10000] if args.quick else [1000, 10000, 20000]
+            results.update(bench_examples_index(workdir, counts, queries=200, seed=args.seed))
+        if "endpoint" in only:
+            print("▶ /generate-readme load")
+            results.update(bench_endpoint(workdir, "small", requests, args.concurrency, args.seed))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "env": {k: v for k, v in os.environ.items() if k.startswith(("FAKE_", "LLM_PROVIDER"))},
+        },
+        "results": results,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"✅ Results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
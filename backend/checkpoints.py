@@ -0,0 +1,292 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, jobs are not guarded against concurrent workers
+    fcntl = None
+
+logger = logging.getLogger("GitReadmeCheckpoints")
+
+
+class JobInProgressError(RuntimeError):
+    """Raised when another worker holds the workspace of the same job."""
+
+
+class JobCheckpoint:
+    """
+    Workspace + checkpoints for one README generation job.
+
+    Everything for a job lives under `<root>/<job_id>/`:
+        repo/              the clone
+        corpus, corpus.json extracted CorpusStore
+        map/<i>.txt        one map summary per corpus chunk
+        summary.txt        reduce output
+        code_index/        FAISS code index (retrieval generation only)
+        readme.md          final README
+        state.json         completed stages
+
+    A retry of the same job (same URL + method) resumes after the last
+    completed stage instead of re-cloning and re-summarizing everything.
+
+    The workspace is held under an exclusive flock on `<root>/<job_id>.lock`
+    until `release()` (or the end of a `with` block), so two workers never
+    share it. A second worker waits up to `lock_timeout` seconds for the lock,
+    then resumes from the first one's checkpoints, or gets JobInProgressError.
+
+    A dry run (`mark_plan_only`) leaves a workspace that only a following
+    generation uses; those are swept after a short TTL or beyond a count cap.
+    """
+
+    STAGES = ("clone", "extract", "map", "reduce", "index", "final")
+
+    LOCK_POLL_SECONDS = 0.5
+
+    def __init__(self, job_id: str, root: str = "projects", ttl_hours: float = None,
+                 lock_timeout: float = None):
+        self.job_id = job_id
+        self.dir = os.path.join(root, job_id)
+        self.ttl_seconds = 3600 * (
+            ttl_hours if ttl_hours is not None
+            else float(os.getenv("GITREADME_CHECKPOINT_TTL_HOURS", "24"))
+        )
+
+        os.makedirs(root, exist_ok=True)
+        self._lock_path = os.path.join(root, f"{job_id}.lock")
+        self._lock = self._wait_for_lock(
+            self._lock_path,
+            lock_timeout if lock_timeout is not None
+            else float(os.getenv("GITREADME_JOB_LOCK_TIMEOUT", "300"))
+        )
+        if self._lock is False:
+            raise JobInProgressError(f"Job {job_id} is already in progress, try again later")
+
+        os.makedirs(os.path.join(self.dir, "map"), exist_ok=True)
+        self.state = self._load_state()
+
+        # Old checkpoints may describe a repo that has moved on; start over
+        if self.state["created"] + self.ttl_seconds < time.time():
+            logger.info(f"Checkpoint for {job_id} expired, starting fresh")
+            self.clear()
+            os.makedirs(os.path.join(self.dir, "map"), exist_ok=True)
+            self.state = self._load_state()
+
+        # Record the creation time right away, so sweep_expired can age this workspace
+        if not os.path.exists(self._state_path()):
+            self._save_state()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    @staticmethod
+    def job_id_for(github_url: str, *parts: str) -> str:
+        """Stable id: readable repo name plus a hash of the URL and job options."""
+        name = github_url.rstrip("/").split("/")[-1]
+        name = re.sub(r"[^\w\-.]", "_", name)[:40] or "repo"
+        digest = hashlib.sha1("|".join((github_url,) + parts).encode("utf-8")).hexdigest()[:12]
+        return f"{name}-{digest}"
+
+    @classmethod
+    def sweep_expired(cls, root: str = "projects", ttl_hours: float = None,
+                      plan_ttl_minutes: float = None, max_plans: int = None) -> int:
+        """
+        Delete every workspace under `root` that no worker holds and that is
+        older than the TTL (e.g. failed jobs that were never retried), or that
+        a dry run left and no generation picked up within `plan_ttl_minutes`.
+        Beyond `max_plans` dry-run workspaces, the oldest are deleted too.
+        Workspaces without a state.json (older layouts) are aged by their
+        folder mtime. Returns the number of workspaces removed.
+        """
+        ttl_seconds = 3600 * (
+            ttl_hours if ttl_hours is not None
+            else float(os.getenv("GITREADME_CHECKPOINT_TTL_HOURS", "24"))
+        )
+        plan_ttl_seconds = 60 * (
+            plan_ttl_minutes if plan_ttl_minutes is not None
+            else float(os.getenv("GITREADME_PLAN_TTL_MINUTES", "15"))
+        )
+        max_plans = max_plans if max_plans is not None else int(os.getenv("GITREADME_MAX_PLAN_WORKSPACES", "8"))
+        if not os.path.isdir(root):
+            return 0
+
+        expired, plans = [], []
+        now = time.time()
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if name.endswith(".lock"):
+                if not os.path.isdir(path[:-len(".lock")]):
+                    cls._drop_stale_lock(path)
+                continue
+            if not os.path.isdir(path):
+                continue
+
+            try:
+                with open(os.path.join(path, "state.json"), "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                created, planned = state["created"], state.get("plan_only")
+            except (OSError, ValueError, KeyError):
+                try:
+                    created, planned = os.path.getmtime(path), None
+                except OSError:
+                    continue
+
+            if created + ttl_seconds < now or (planned and planned + plan_ttl_seconds < now):
+                expired.append(path)
+            elif planned:
+                plans.append((planned, path))
+
+        # Newest dry runs are the likeliest to be followed by a generation
+        plans.sort(reverse=True)
+        expired += [path for _, path in plans[max_plans:]]
+
+        removed = 0
+        for path in expired:
+            lock_path = f"{path}.lock"
+            lock = cls._try_lock(lock_path)
+            if lock is False:
+                continue
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+                logger.info(f"Removed expired job workspace {path}")
+            finally:
+                cls._unlock(lock, lock_path)
+
+        return removed
+
+    @classmethod
+    def _drop_stale_lock(cls, lock_path: str):
+        """Remove a lock file left by a crashed worker (nobody holds it)."""
+        lock = cls._try_lock(lock_path)
+        if lock is not False:
+            cls._unlock(lock, lock_path)
+
+    # ------------------------------------------------------------
+    # Locking
+    # ------------------------------------------------------------
+    @staticmethod
+    def _try_lock(path: str):
+        """
+        Open `path` and take an exclusive, non-blocking flock on it.
+        Returns the open file, False if another process holds it, or None
+        when flock is unavailable.
+        """
+        if fcntl is None:
+            return None
+
+        while True:
+            handle = open(path, "a")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return False
+
+            # The previous holder unlinks the file on release; if that happened
+            # between our open and flock, we locked a dead inode, so retry
+            try:
+                if os.fstat(handle.fileno()).st_ino == os.stat(path).st_ino:
+                    return handle
+            except FileNotFoundError:
+                pass
+            handle.close()
+
+    @classmethod
+    def _wait_for_lock(cls, path: str, timeout: float):
+        """`_try_lock`, retried every LOCK_POLL_SECONDS for up to `timeout` seconds."""
+        deadline = time.monotonic() + timeout
+        lock = cls._try_lock(path)
+        while lock is False and time.monotonic() < deadline:
+            time.sleep(cls.LOCK_POLL_SECONDS)
+            lock = cls._try_lock(path)
+        return lock
+
+    @staticmethod
+    def _unlock(handle, path: str):
+        """Unlink `path` while still holding its lock, then close it."""
+        if handle:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            handle.close()
+
+    def release(self):
+        """Drop the workspace lock (the workspace itself is kept for a retry)."""
+        self._unlock(self._lock, self._lock_path)
+        self._lock = None
+
+    # ------------------------------------------------------------
+    # Stage bookkeeping
+    # ------------------------------------------------------------
+    def _state_path(self) -> str:
+        return os.path.join(self.dir, "state.json")
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self._state_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"created": time.time(), "stages": {}}
+
+    def _save_state(self):
+        tmp_path = self._state_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self._state_path())
+
+    def is_done(self, stage: str) -> bool:
+        return stage in self.state["stages"]
+
+    def mark_done(self, stage: str):
+        self.state["stages"][stage] = time.time()
+        self._save_state()
+
+    def mark_plan_only(self, plan_only: bool = True):
+        """Flag a workspace left by a dry run (swept early unless a generation follows)."""
+        if plan_only:
+            self.state["plan_only"] = time.time()
+        else:
+            self.state.pop("plan_only", None)
+        self._save_state()
+
+    @property
+    def resumed_stages(self) -> list:
+        return [s for s in self.STAGES if self.is_done(s)]
+
+    # ------------------------------------------------------------
+    # Stage outputs
+    # ------------------------------------------------------------
+    def path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def save_text(self, name: str, text: str):
+        tmp_path = self.path(name) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, self.path(name))
+
+    def load_text(self, name: str):
+        try:
+            with open(self.path(name), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def save_map(self, index: int, summary: str):
+        self.save_text(os.path.join("map", f"{index}.txt"), summary)
+
+    def load_map(self, index: int):
+        return self.load_text(os.path.join("map", f"{index}.txt"))
+
+    def clear(self):
+        """Remove the whole job workspace (clone included)."""
+        shutil.rmtree(self.dir, ignore_errors=True)
@@ -0,0 +1,267 @@
+import bisect
+import json
+import logging
+import mmap
+import os
+from array import array
+
+logger = logging.getLogger("GitReadmeCorpus")
+
+
+class ChunkView:
+    """
+    Lightweight handle on one chunk of a CorpusStore.
+    Text is only decoded from the mapped file when `page_content` is read, so a
+    list of views costs a few dozen bytes per chunk instead of a full copy.
+    """
+
+    __slots__ = ("corpus", "index", "start", "end")
+
+    def __init__(self, corpus, index: int, start: int, end: int):
+        self.corpus = corpus
+        self.index = index
+        self.start = start
+        self.end = end
+
+    @property
+    def page_content(self) -> str:
+        return self.corpus.render(self.start, self.end)
+
+    @property
+    def metadata(self) -> dict:
+        return {"source": self.corpus.source_at(self.start), "chunk": self.index}
+
+    def __len__(self):
+        return self.end - self.start
+
+
+class CorpusStore:
+    """
+    Extracted repo text stored once, in a single memory-mapped file.
+
+    `<path>` holds the UTF-8 bytes of every file back to back; `<path>.json`
+    holds the offset index (per file and per chunk). Small files are packed
+    into shared chunks, large ones split on line boundaries, mirroring the
+    "\\nFile:" splitter in Generators.summarize_code.
+    """
+
+    HEADER = "File: {}\n"
+
+    def __init__(self, path: str, paths: list, file_starts, file_ends,
+                 chunk_starts, chunk_ends, mapped=None):
+        self.path = path
+        self.paths = paths
+        self.file_starts = file_starts
+        self.file_ends = file_ends
+        self.chunk_starts = chunk_starts
+        self.chunk_ends = chunk_ends
+        self._mm = mapped
+
+    # ------------------------------------------------------------
+    # Build / open
+    # ------------------------------------------------------------
+    @classmethod
+    def build(cls, folder_name: str, path: str, allowed_extensions: set,
+              chunk_size: int, chunk_overlap: int) -> "CorpusStore":
+        """Stream every readable source file under `folder_name` into `path`."""
+        paths = []
+        file_starts, file_ends = array("Q"), array("Q")
+        chunk_starts, chunk_ends = array("Q"), array("Q")
+
+        offset = 0
+        open_start, open_size = None, 0     # chunk currently being packed
+
+        with open(path, "wb") as out:
+            for root, _, files in os.walk(folder_name):
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    _, ext = os.path.splitext(file)
+
+                    # Skip binary / unknown file types
+                    if ext.lower() not in allowed_extensions:
+                        continue
+
+                    try:
+                        with open(file_path, "r", encoding="utf-8") as f:
+                            data = f.read().encode("utf-8")
+                    except Exception as e:
+                        logger.warning(f"Error reading file {file}: {e}")
+                        continue
+
+                    if not data:
+                        continue
+
+                    paths.append(file_path)
+                    file_starts.append(offset)
+                    file_ends.append(offset + len(data))
+                    cost = len(data) + len(cls.HEADER.format(file_path)) + 2
+
+                    # Close the packed chunk if this file does not fit in it
+                    if open_start is not None and open_size + cost > chunk_size:
+                        chunk_starts.append(open_start)
+                        chunk_ends.append(offset)
+                        open_start, open_size = None, 0
+
+                    if cost <= chunk_size:
+                        if open_start is None:
+                            open_start = offset
+                        open_size += cost
+                    else:
+                        bounds = list(cls._chunk_bounds(data, chunk_size, chunk_overlap))
+                        for start, end in bounds[:-1]:
+                            chunk_starts.append(offset + start)
+                            chunk_ends.append(offset + end)
+                        # The tail of a large file can still share a chunk with the next files
+                        tail_start, tail_end = bounds[-1]
+                        open_start, open_size = offset + tail_start, tail_end - tail_start
+
+                    out.write(data)
+                    offset += len(data)
+
+        if open_start is not None:
+            chunk_starts.append(open_start)
+            chunk_ends.append(offset)
+
+        corpus = cls(path, paths, file_starts, file_ends, chunk_starts, chunk_ends)
+        corpus._save_index()
+        corpus._map()
+        return corpus
+
+    @classmethod
+    def open(cls, path: str) -> "CorpusStore":
+        """Re-open a corpus previously written by `build`."""
+        with open(f"{path}.json", "r", encoding="utf-8") as f:
+            index = json.load(f)
+
+        corpus = cls(
+            path,
+            index["paths"],
+            array("Q", index["file_starts"]),
+            array("Q", index["file_ends"]),
+            array("Q", index["chunk_starts"]),
+            array("Q", index["chunk_ends"]),
+        )
+        corpus._map()
+        return corpus
+
+    def _save_index(self):
+        index = {
+            "paths": self.paths,
+            "file_starts": self.file_starts.tolist(),
+            "file_ends": self.file_ends.tolist(),
+            "chunk_starts": self.chunk_starts.tolist(),
+            "chunk_ends": self.chunk_ends.tolist(),
+        }
+        with open(f"{self.path}.json", "w", encoding="utf-8") as f:
+            json.dump(index, f)
+
+    def _map(self):
+        if os.path.getsize(self.path) == 0:
+            self._mm = None     # mmap refuses empty files
+            return
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _chunk_bounds(data: bytes, chunk_size: int, chunk_overlap: int):
+        """
+        Byte ranges of at most `chunk_size`, preferring to end on a newline in
+        the second half of the window and never splitting a UTF-8 character.
+        """
+        start, length = 0, len(data)
+        while start < length:
+            end = min(start + chunk_size, length)
+            if end < length:
+                newline = data.rfind(b"\n", start + chunk_size // 2, end)
+                if newline != -1:
+                    end = newline + 1
+                else:
+                    while end > start + 1 and (data[end] & 0xC0) == 0x80:
+                        end -= 1
+            yield start, end
+
+            if end >= length:
+                break
+
+            # Overlap: restart on a line boundary inside the last `chunk_overlap` bytes
+            next_start = max(end - chunk_overlap, start + 1)
+            newline = data.find(b"\n", next_start, end)
+            if newline != -1:
+                next_start = newline + 1
+            while next_start < end and (data[next_start] & 0xC0) == 0x80:
+                next_start += 1
+            start = next_start
+
+    # ------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------
+    def read(self, start: int, end: int) -> str:
+        if self._mm is None:
+            return ""
+        return self._mm[start:end].decode("utf-8", errors="ignore")
+
+    def source_at(self, offset: int) -> str:
+        return self.paths[bisect.bisect_right(self.file_starts, offset) - 1]
+
+    def render(self, start: int, end: int) -> str:
+        """Text of [start, end) with a "File: <path>" header per file segment."""
+        parts = []
+        index = bisect.bisect_right(self.file_starts, start) - 1
+        while index < len(self.paths) and self.file_starts[index] < end:
+            seg_start = max(start, self.file_starts[index])
+            seg_end = min(end, self.file_ends[index])
+            parts.append(self.HEADER.format(self.paths[index]) + self.read(seg_start, seg_end))
+            index += 1
+        return "\n\n".join(parts)
+
+    def chunk(self, index: int) -> ChunkView:
+        return ChunkView(self, index, self.chunk_starts[index], self.chunk_ends[index])
+
+    def __len__(self):
+        return len(self.chunk_starts)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.chunk(index)
+
+    @property
+    def text_length(self) -> int:
+        """Bytes of source text covered by this corpus."""
+        return self.file_ends[-1] - self.file_starts[0] if self.paths else 0
+
+    @property
+    def file_count(self) -> int:
+        return len(self.paths)
+
+    def truncated(self, max_bytes: int) -> "CorpusStore":
+        """Corpus restricted to the leading chunks that fit in `max_bytes` (shares the mapping)."""
+        base = self.file_starts[0] if self.paths else 0
+        chunks = bisect.bisect_right(self.chunk_ends, base + max_bytes)
+        cut = self.chunk_ends[chunks - 1] if chunks else base
+        files = bisect.bisect_left(self.file_starts, cut)
+
+        # The cut may fall inside the last kept file: only its leading part is covered
+        file_ends = self.file_ends[:files]
+        if files and file_ends[-1] > cut:
+            file_ends[-1] = cut
+        return CorpusStore(
+            self.path,
+            self.paths[:files],
+            self.file_starts[:files],
+            file_ends,
+            self.chunk_starts[:chunks],
+            self.chunk_ends[:chunks],
+            mapped=self._mm
+        )
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def delete(self):
+        """Close the mapping and remove the corpus files."""
+        self.close()
+        for path in (self.path, f"{self.path}.json"):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,340 @@
+import hashlib
+import json
+import logging
+import os
+import re
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger("GitReadmeExamplesIndex")
+
+
+class ExamplesIndex:
+    """
+    Section-level ANN index over exemplar READMEs.
+
+    Each README is split into "## " sections tagged with the README's
+    `language` and `project_type`. Tags come from front matter
+    (`language: python` lines between leading `---` markers) or from the
+    folder layout examples/<language>/<project_type>/*.md, else "any".
+
+    There is one FAISS index per language, so filtering by language happens
+    before the search instead of after it; an unfiltered search queries every
+    partition. Each vector is stored once. Partitions above HNSW_THRESHOLD
+    sections use HNSW; smaller ones are exact.
+    """
+
+    VERSION = "v4"
+    ANY = "any"
+
+    HNSW_THRESHOLD = 2000
+    HNSW_M = 32
+    HNSW_EF_SEARCH = 64
+    SECTION_MAX_CHARS = 1500
+    SECTION_OVERLAP = 200
+    EMBED_BATCH = 256
+
+    def __init__(self, sections: list, partitions: dict):
+        self.sections = sections        # [{"source", "heading", "text", "language", "project_type"}]
+        self.partitions = partitions    # key -> (faiss index, array of section ids)
+
+    def __len__(self):
+        return len(self.sections)
+
+    # ------------------------------------------------------------
+    # Loading exemplar READMEs
+    # ------------------------------------------------------------
+    @classmethod
+    def read_directory(cls, root: str) -> list:
+        """Return [(text, {"source", "language", "project_type"})] for every .md under `root`."""
+        documents = []
+        for folder, _, files in os.walk(root):
+            for file in sorted(files):
+                if not file.endswith(".md"):
+                    continue
+                path = os.path.join(folder, file)
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        text = f.read()
+                except Exception as e:
+                    logger.warning(f"Error reading {file}: {e}")
+                    continue
+
+                # Folder layout gives the default tags, front matter overrides them
+                parts = os.path.relpath(folder, root).split(os.sep)
+                parts = [] if parts == ["."] else parts
+                metadata = {
+                    "source": path,
+                    "language": parts[0].lower() if len(parts) > 0 else cls.ANY,
+                    "project_type": parts[1].lower() if len(parts) > 1 else cls.ANY,
+                }
+                text, front_matter = cls._split_front_matter(text)
+                metadata.update({k: v.lower() for k, v in front_matter.items()
+                                 if k in ("language", "project_type")})
+                documents.append((text, metadata))
+        return documents
+
+    @staticmethod
+    def _split_front_matter(text: str):
+        if not text.startswith("---\n"):
+            return text, {}
+        end = text.find("\n---", 4)
+        if end == -1:
+            return text, {}
+        front_matter = {}
+        for line in text[4:end].splitlines():
+            if ":" in line:
+                key, value = line.split(":", 1)
+                front_matter[key.strip()] = value.strip().strip("\"'")
+        return text[end + 4:].lstrip("\n"), front_matter
+
+    @classmethod
+    def split_sections(cls, text: str) -> list:
+        """
+        Split markdown on level 1-2 headings: [(heading, section text)].
+        Lines inside ``` / ~~~ fences are never headings (shell comments).
+        Sections over SECTION_MAX_CHARS become overlapping chunks under the
+        same heading instead of being cut off.
+        """
+        sections, heading, lines = [], "Introduction", []
+        fence = None
+        for line in text.splitlines():
+            marker = re.match(r"^\s{0,3}(`{3,}|~{3,})", line)
+            if marker:
+                if fence is None:
+                    fence = marker.group(1)
+                elif marker.group(1)[0] == fence[0] and len(marker.group(1)) >= len(fence):
+                    fence = None
+
+            match = None if fence or marker else re.match(r"^#{1,2}\s+(.*)", line)
+            if match and lines:
+                sections.append((heading, "\n".join(lines).strip()))
+                lines = []
+            if match:
+                heading = match.group(1).strip()
+            lines.append(line)
+        if lines:
+            sections.append((heading, "\n".join(lines).strip()))
+        return [(h, chunk) for h, body in sections if body for chunk in cls._chunk_section(body)]
+
+    @classmethod
+    def _chunk_section(cls, body: str) -> list:
+        """
+        `body` in windows of at most SECTION_MAX_CHARS that overlap by about
+        SECTION_OVERLAP, cut at a line break or space where possible.
+        """
+        chunks, start = [], 0
+        while len(body) - start > cls.SECTION_MAX_CHARS:
+            end = start + cls.SECTION_MAX_CHARS
+            floor = start + cls.SECTION_MAX_CHARS // 2
+            cut = max(body.rfind("\n", floor, end), body.rfind(" ", floor, end))
+            cut = end if cut == -1 else cut
+            chunks.append(body[start:cut].strip())
+
+            # Next window starts SECTION_OVERLAP back, on a word boundary
+            start = cut - cls.SECTION_OVERLAP
+            boundary = body.find(" ", start, cut)
+            start = boundary + 1 if boundary != -1 else start
+        chunks.append(body[start:].strip())
+        return [chunk for chunk in chunks if chunk]
+
+    # ------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------
+    @classmethod
+    def build(cls, documents: list, embeddings) -> "ExamplesIndex":
+        """Embed every section of `documents` and build the partitioned index."""
+        sections = []
+        for text, metadata in documents:
+            for heading, body in cls.split_sections(text):
+                sections.append(dict(metadata, heading=heading, text=body))
+
+        if not sections:
+            return cls([], {})
+
+        # Fill one float32 matrix batch by batch (a list of Python floats is ~6x larger)
+        matrix = None
+        for offset in range(0, len(sections), cls.EMBED_BATCH):
+            batch = sections[offset:offset + cls.EMBED_BATCH]
+            vectors = np.asarray(embeddings.embed_documents([s["text"] for s in batch]), dtype="float32")
+            if matrix is None:
+                matrix = np.empty((len(sections), vectors.shape[1]), dtype="float32")
+            matrix[offset:offset + len(batch)] = vectors
+        faiss.normalize_L2(matrix)
+
+        languages = np.array([s["language"] for s in sections])
+        partitions = {}
+        for language in sorted(set(languages.tolist())):
+            ids = np.flatnonzero(languages == language).astype("int64")
+            partitions[language] = (cls._make_index(matrix[ids]), ids)
+        return cls(sections, partitions)
+
+    @classmethod
+    def _make_index(cls, vectors: np.ndarray):
+        dim = vectors.shape[1]
+        if len(vectors) > cls.HNSW_THRESHOLD:
+            index = faiss.IndexHNSWFlat(dim, cls.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = cls.HNSW_EF_SEARCH
+        else:
+            index = faiss.IndexFlatIP(dim)
+        index.add(vectors)
+        return index
+
+    # ------------------------------------------------------------
+    # Persistence (keyed by a fingerprint of the examples folder)
+    # ------------------------------------------------------------
+    @classmethod
+    def fingerprint(cls, root: str, embeddings) -> str:
+        digest = hashlib.sha1(cls.VERSION.encode("utf-8"))
+        identity = f"{type(embeddings).__name__}:{getattr(embeddings, 'model', '')}:{getattr(embeddings, 'dim', '')}"
+        digest.update(identity.encode("utf-8"))
+        for folder, _, files in sorted(os.walk(root)):
+            for file in sorted(files):
+                if file.endswith(".md"):
+                    stat = os.stat(os.path.join(folder, file))
+                    digest.update(f"{folder}/{file}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def path_for(cls, root: str, embeddings, cache_dir: str = None) -> str:
+        """Where the index for the current examples folder and embeddings is saved."""
+        cache_dir = cache_dir or os.getenv("GITREADME_EXAMPLES_INDEX_DIR", "examples_index")
+        return os.path.join(cache_dir, cls.fingerprint(root, embeddings))
+
+    @classmethod
+    def load_prebuilt(cls, root: str, embeddings, cache_dir: str = None):
+        """
+        Saved index for the current examples folder, or None if it was not built.
+        Request handlers only load; building is `python -m examples_index build`
+        or the server's background build at startup.
+        """
+        path = cls.path_for(root, embeddings, cache_dir)
+        if not os.path.exists(os.path.join(path, "sections.json")):
+            return None
+        return cls.load(path)
+
+    @classmethod
+    def load_or_build(cls, root: str, embeddings, cache_dir: str = None) -> "ExamplesIndex":
+        """Load the saved index for the current examples folder, building it if missing."""
+        index = cls.load_prebuilt(root, embeddings, cache_dir)
+        if index is not None:
+            return index
+
+        path = cls.path_for(root, embeddings, cache_dir)
+        index = cls.build(cls.read_directory(root), embeddings)
+        index.save(path)
+        logger.info(f"Built examples index: {len(index)} sections → {path}")
+        return index
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        names = {}
+        for i, (key, (index, ids)) in enumerate(self.partitions.items()):
+            names[key] = f"part{i}"
+            faiss.write_index(index, os.path.join(path, f"part{i}.faiss"))
+            np.save(os.path.join(path, f"part{i}.ids.npy"), ids)
+        with open(os.path.join(path, "partitions.json"), "w", encoding="utf-8") as f:
+            json.dump(names, f)
+        # sections.json last: its presence marks a complete index
+        with open(os.path.join(path, "sections.json"), "w", encoding="utf-8") as f:
+            json.dump(self.sections, f)
+
+    @classmethod
+    def load(cls, path: str) -> "ExamplesIndex":
+        with open(os.path.join(path, "sections.json"), "r", encoding="utf-8") as f:
+            sections = json.load(f)
+        with open(os.path.join(path, "partitions.json"), "r", encoding="utf-8") as f:
+            names = json.load(f)
+
+        partitions = {}
+        for key, name in names.items():
+            index = faiss.read_index(os.path.join(path, f"{name}.faiss"))
+            if isinstance(index, faiss.IndexHNSWFlat):
+                index.hnsw.efSearch = cls.HNSW_EF_SEARCH
+            partitions[key] = (index, np.load(os.path.join(path, f"{name}.ids.npy")))
+        return cls(sections, partitions)
+
+    # ------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------
+    def search(self, query_vector, k: int = 4, language: str = None,
+               project_type: str = None, per_source: int = 2) -> list:
+        """
+        Top-k sections for `query_vector`. With `language`, only that language's
+        and untagged ("any") examples are searched; the other partitions top
+        up when they have too few matches. Sections of the same
+        `project_type` rank first, and at most `per_source` come from one README.
+        """
+        if not self.sections:
+            return []
+
+        query = np.asarray([query_vector], dtype="float32")
+        faiss.normalize_L2(query)
+
+        keys = list(self.partitions)
+        if language and language.lower() in self.partitions:
+            keys = [language.lower()] + ([self.ANY] if self.ANY in self.partitions else [])
+
+        fetch = k * 4
+        scored = self._search_partitions(keys, query, fetch)
+        others = [key for key in self.partitions if key not in keys]
+        if len(scored) < fetch and others:
+            scored += self._search_partitions(others, query, fetch)
+
+        if project_type:
+            project_type = project_type.lower()
+            # Stable sort: keeps score order inside each group
+            scored.sort(key=lambda hit: self.sections[hit[1]]["project_type"] != project_type)
+
+        results, per_doc = [], {}
+        for score, sid in scored:
+            section = self.sections[sid]
+            if per_doc.get(section["source"], 0) >= per_source:
+                continue
+            per_doc[section["source"]] = per_doc.get(section["source"], 0) + 1
+            results.append(dict(section, score=score))
+            if len(results) == k:
+                break
+        return results
+
+    def _search_partitions(self, keys: list, query: np.ndarray, fetch: int) -> list:
+        scored = []
+        for key in keys:
+            index, ids = self.partitions[key]
+            scores, positions = index.search(query, min(fetch, index.ntotal))
+            scored += [
+                (float(score), int(ids[pos]))
+                for score, pos in zip(scores[0], positions[0]) if pos >= 0
+            ]
+        scored.sort(key=lambda hit: -hit[0])
+        return scored
+
+
+# ------------------------------------------------------------
+# Prebuild: python -m examples_index build
+# ------------------------------------------------------------
+def main(argv=None) -> int:
+    import argparse
+    import time
+    from gitreadme_brain import GitReadmeBrain
+
+    parser = argparse.ArgumentParser(description="Build the examples index ahead of requests")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--examples-dir", default=os.getenv("GITREADME_EXAMPLES_DIR", "examples"))
+    parser.add_argument("--index-dir", default=None, help="defaults to GITREADME_EXAMPLES_INDEX_DIR")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    embeddings = GitReadmeBrain().getEmbeddingModel()
+
+    start = time.perf_counter()
+    index = ExamplesIndex.load_or_build(args.examples_dir, embeddings, args.index_dir)
+    print(f"✅ Examples index ready: {len(index)} sections in {time.perf_counter() - start:.1f}s "
+          f"→ {ExamplesIndex.path_for(args.examples_dir, embeddings, args.index_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -3,6 +3,7 @@ FastAPI GitReadme Application (OpenAI Version)
 """
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from pydantic import BaseModel
@@ -64,6 +65,13 @@ class ReadmeResponse(BaseModel):
     repo_url: str
     generation_method: str
 
+class PlanResponse(BaseModel):
+    success: bool
+    plan: dict = {}
+    error_message: str = ""
+    repo_url: str
+    generation_method: str
+
 # ------------------------------------------------------------------------------
 # Initialize AI App
 # ------------------------------------------------------------------------------
@@ -74,6 +82,14 @@ except Exception as e:
     logger.error(f"Initialization failed: {e}")
     readme_app = None
 
+# ------------------------------------------------------------------------------
+# EXAMPLES INDEX: built in the background so startup never waits on embeddings
+# ------------------------------------------------------------------------------
+@app.on_event("startup")
+async def load_examples_index():
+    if readme_app:
+        readme_app.generator.start_examples_index_build(readme_app.embeddings)
+
 # ------------------------------------------------------------------------------
 # HEALTH CHECK  ✔ REQUIRED FOR RENDER
 # ------------------------------------------------------------------------------
@@ -102,7 +118,10 @@ async def generate_readme(request: ReadmeRequest):
         raise HTTPException(503, "Service unavailable")
 
     try:
-        content = readme_app.generate_readme_from_repo_url(
+        # The pipeline blocks (git, disk, LLM calls); keep it off the event loop
+        # so concurrent requests actually run concurrently
+        content = await run_in_threadpool(
+            readme_app.generate_readme_from_repo_url,
             request.repo_url,
             request.generation_method
         )
@@ -124,3 +143,39 @@ async def generate_readme(request: ReadmeRequest):
             repo_url=request.repo_url,
             generation_method=request.generation_method
         )
+
+# ------------------------------------------------------------------------------
+# DRY RUN: PREDICTED CHUNKS / LLM CALLS / LATENCY
+# ------------------------------------------------------------------------------
+@app.post("/plan-readme", response_model=PlanResponse)
+@log_request_metrics
+async def plan_readme(request: ReadmeRequest):
+
+    if not validate_github_url(request.repo_url):
+        raise HTTPException(400, "Invalid GitHub URL")
+
+    if not readme_app:
+        raise HTTPException(503, "Service unavailable")
+
+    try:
+        plan = await run_in_threadpool(
+            readme_app.plan_readme_from_repo_url,
+            request.repo_url,
+            request.generation_method
+        )
+
+        return PlanResponse(
+            success=True,
+            plan=plan,
+            repo_url=request.repo_url,
+            generation_method=request.generation_method
+        )
+
+    except Exception as e:
+        logger.error(str(e))
+        return PlanResponse(
+            success=False,
+            error_message=str(e),
+            repo_url=request.repo_url,
+            generation_method=request.generation_method
+        )
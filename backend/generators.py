@@ -1,22 +1,54 @@
 import os
+import threading
 from langchain_core.documents import Document
 from langchain.chains.summarize import load_summarize_chain
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import PromptTemplate
 from langchain.chains import LLMChain
+from langchain.chains.summarize import map_reduce_prompt
+
+from examples_index import ExamplesIndex
 
 
 class Generators:
 
+    # Splitter settings for the code map-reduce (shared with the planner)
+    CHUNK_SIZE = 3000
+    CHUNK_OVERLAP = 200
+
+    # Summaries longer than this are condensed before the final prompt
+    CONDENSE_THRESHOLD = 2000
+    EXAMPLES_CONDENSE_THRESHOLD = 800
+    CONDENSE_CHUNK_SIZE = 600
+    CONDENSE_CHUNK_OVERLAP = 100
+
+    # Sections for retrieval-based generation: (heading, retrieval query)
+    # A None query means the section is written from the project context alone
+    README_SECTIONS = [
+        ("Overview", None),
+        ("Features", "main features capabilities modules components"),
+        ("Installation", "install dependencies requirements setup package.json pyproject Dockerfile"),
+        ("Usage", "main entry point command line usage example run start server"),
+        ("API Details", "API endpoints routes request response public functions classes"),
+        ("Configuration", "configuration environment variables settings config options defaults"),
+        ("Development & Contribution", "tests build scripts lint CI workflow contributing"),
+        ("License", "license copyright"),
+    ]
+
+    # Retrieval generation skips the map-reduce summary; the project context
+    # is the repo's top-level files instead (README first), capped at these sizes
+    CONTEXT_FILE_CHARS = 1500
+    CONTEXT_MAX_CHARS = 4000
+
     # ------------------------------------------------------------
     # 🧠 CODE SUMMARIZATION (Gemini-safe output)
     # ------------------------------------------------------------
     def summarize_code(self, llm, code_text):
 
         text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=3000,
-            chunk_overlap=200,
+            chunk_size=self.CHUNK_SIZE,
+            chunk_overlap=self.CHUNK_OVERLAP,
             separators=["\nFile:", "\n\n", "\n", " ", ""]
         )
 
@@ -30,41 +62,98 @@ class Generators:
 
         return self._to_text(result)
 
+    # ------------------------------------------------------------
+    # 🧠 CODE SUMMARIZATION OVER A MEMORY-MAPPED CORPUS
+    # ------------------------------------------------------------
+    def summarize_corpus(self, llm, corpus, window: int = None, checkpoint=None):
+        """
+        Map-reduce over CorpusStore chunk views. Only `window` chunk texts are
+        materialized at a time; the reduce step is LangChain's, as in summarize_code.
+        With a JobCheckpoint, each map result is saved as soon as it returns and
+        chunks already summarized by an earlier attempt are skipped.
+        """
+        window = window or int(os.getenv("GITREADME_MAP_WINDOW", "32"))
+        concurrency = int(os.getenv("GITREADME_LLM_CONCURRENCY", "4"))
+
+        map_summaries = [None] * len(corpus)
+        if checkpoint:
+            for index in range(len(corpus)):
+                map_summaries[index] = checkpoint.load_map(index)
+
+        todo = [i for i, summary in enumerate(map_summaries) if summary is None]
+        print(f"Processing {len(todo)} of {len(corpus)} corpus chunks in windows of {window}")
+
+        for offset in range(0, len(todo), window):
+            indexes = todo[offset:offset + window]
+            results = self._map_views(llm, [corpus.chunk(i) for i in indexes], concurrency)
+
+            failure = None
+            for index, result in zip(indexes, results):
+                if isinstance(result, Exception):
+                    failure = failure or result
+                    continue
+                map_summaries[index] = result
+                if checkpoint:
+                    checkpoint.save_map(index, result)
+            if failure:
+                raise failure
+
+        if checkpoint:
+            checkpoint.mark_done("map")
+
+        if not map_summaries:
+            return ""
+
+        chain = load_summarize_chain(llm, chain_type="map_reduce")
+        result = chain.reduce_documents_chain.invoke({
+            "input_documents": [Document(page_content=s) for s in map_summaries]
+        })
+        return self._to_text(result)
+
+    def _map_views(self, llm, views, concurrency):
+        """Map prompts for `views`; failed calls come back as exceptions, not raised."""
+        prompts = [map_reduce_prompt.PROMPT.format(text=v.page_content) for v in views]
+        results = llm.batch(
+            prompts,
+            config={"max_concurrency": concurrency},
+            return_exceptions=True
+        )
+        return [r if isinstance(r, Exception) else self._to_text(r) for r in results]
+
     # ------------------------------------------------------------
     # 🧠 README GENERATION WITH VECTORSTORE (Gemini ready)
     # ------------------------------------------------------------
-    def generate_readme_with_examples_vectorstore(self, llm, embeddings, summary: str) -> str:
+    def generate_readme_with_examples_vectorstore(self, llm, embeddings, summary: str,
+                                                  language: str = None) -> str:
 
         if not isinstance(summary, str):
             print(f"Warning: summary was {type(summary)} — converting.")
             summary = str(summary)
 
-        example_docs = []
-        for root, _, files in os.walk("examples"):
-            for file in files:
-                if file.endswith(".md"):
-                    path = os.path.join(root, file)
-                    try:
-                        with open(path, "r", encoding="utf-8") as f:
-                            example_docs.append(
-                                Document(page_content=f.read(), metadata={"source": path})
-                            )
-                    except Exception as e:
-                        print(f"Error reading {file}: {e}")
-
-        if not example_docs:
-            print("No example README files found → using standard generation")
+        examples_index = self._get_examples_index(embeddings)
+
+        if examples_index is None:
+            print("Examples index not ready yet → using standard generation")
             return self.generate_readme(llm, summary)
 
-        vectorstore = FAISS.from_documents(example_docs, embeddings)
+        if not len(examples_index):
+            print("No example README files found → using standard generation")
+            return self.generate_readme(llm, summary)
 
-        summary_for_search = summary if len(summary) < 800 else self._condense_summary(llm, summary)
-        relevant_examples = vectorstore.similarity_search(summary_for_search, k=2)
+        summary_for_search = summary if len(summary) < self.EXAMPLES_CONDENSE_THRESHOLD else self._condense_summary(llm, summary)
+        relevant_sections = examples_index.search(
+            embeddings.embed_query(summary_for_search),
+            k=int(os.getenv("GITREADME_EXAMPLES_TOP_K", "6")),
+            language=language
+        )
 
         processed = []
-        for doc in relevant_examples:
-            text = doc.page_content[:1000]
-            processed.append(f"### Example Source → {doc.metadata['source']}\n\n{text}")
+        for section in relevant_sections:
+            processed.append(
+                f"### Example Source → {section['source']} "
+                f"({section['language']}, {section['project_type']}) § {section['heading']}\n\n"
+                f"{section['text']}"
+            )
 
         relevant_text = "\n\n".join(processed)
 
@@ -83,6 +172,157 @@ Write full markdown output now.
         result = llm.invoke(prompt)
         return self._to_text(result)
 
+    def _get_examples_index(self, embeddings):
+        """
+        Examples index, loaded once per process; None while it is not built
+        yet (it is never built inside a request).
+        """
+        if getattr(self, "_examples_index", None) is None and not getattr(self, "_examples_index_building", False):
+            self._examples_index = ExamplesIndex.load_prebuilt(
+                os.getenv("GITREADME_EXAMPLES_DIR", "examples"), embeddings
+            )
+        return getattr(self, "_examples_index", None)
+
+    def start_examples_index_build(self, embeddings):
+        """
+        Load or build the examples index on a background thread, so the server
+        answers health checks at once; "README with Examples" uses standard
+        generation until the index is ready.
+        """
+        def build():
+            try:
+                self._examples_index = ExamplesIndex.load_or_build(
+                    os.getenv("GITREADME_EXAMPLES_DIR", "examples"), embeddings
+                )
+                print(f"✅ Examples index ready: {len(self._examples_index)} sections")
+            except Exception as e:
+                print(f"⚠️ Examples index build failed → standard generation is used: {e}")
+            finally:
+                self._examples_index_building = False
+
+        self._examples_index_building = True
+        threading.Thread(target=build, name="examples-index", daemon=True).start()
+
+    # ------------------------------------------------------------
+    # 🧠 README GENERATION WITH CODE RETRIEVAL (per-section, parallel)
+    # ------------------------------------------------------------
+    def build_code_index(self, embeddings, corpus, window: int = None):
+        """
+        FAISS index over the corpus chunks. Only the chunk number and source path
+        are stored; snippet text is read back from the corpus at query time.
+        """
+        window = window or int(os.getenv("GITREADME_MAP_WINDOW", "32"))
+
+        vectorstore = None
+        for offset in range(0, len(corpus), window):
+            views = [corpus.chunk(i) for i in range(offset, min(offset + window, len(corpus)))]
+            vectors = embeddings.embed_documents([v.page_content for v in views])
+            pairs = [(v.metadata["source"], vec) for v, vec in zip(views, vectors)]
+            metadatas = [v.metadata for v in views]
+
+            if vectorstore is None:
+                vectorstore = FAISS.from_embeddings(pairs, embeddings, metadatas=metadatas)
+            else:
+                vectorstore.add_embeddings(pairs, metadatas=metadatas)
+
+        return vectorstore
+
+    def generate_readme_with_code_retrieval(self, llm, embeddings, corpus, code_index=None,
+                                            repo_root: str = None) -> str:
+        """
+        Write each README section from its own top-k code snippets, all sections
+        in parallel, then assemble them in order. There is no repo-wide summary:
+        every prompt gets the top-level files as project context instead, so the
+        only LLM calls are the sections themselves.
+        """
+        context = self._project_context(corpus, repo_root)
+
+        code_index = code_index or self.build_code_index(embeddings, corpus)
+        if code_index is None:
+            print("No code chunks indexed → using standard generation")
+            return self.generate_readme(llm, context)
+
+        top_k = int(os.getenv("GITREADME_SECTION_TOP_K", "4"))
+        queried = [(title, query) for title, query in self.README_SECTIONS if query]
+        query_vectors = dict(zip(
+            [title for title, _ in queried],
+            embeddings.embed_documents([query for _, query in queried])
+        ))
+
+        prompts = []
+        for title, query in self.README_SECTIONS:
+            snippets = ""
+            if query:
+                hits = code_index.similarity_search_by_vector(query_vectors[title], k=top_k)
+                snippets = "\n\n".join(
+                    corpus.chunk(doc.metadata["chunk"]).page_content for doc in hits
+                )
+            prompts.append(self._section_prompt(title, context, snippets))
+
+        concurrency = int(os.getenv("GITREADME_LLM_CONCURRENCY", "4"))
+        results = llm.batch(prompts, config={"max_concurrency": concurrency})
+
+        sections = []
+        for (title, _), result in zip(self.README_SECTIONS, results):
+            text = self._to_text(result)
+            if text and text.strip().upper() != "SKIP":
+                sections.append(text)
+
+        return "\n\n".join(sections)
+
+    def _project_context(self, corpus, repo_root: str = None) -> str:
+        """Top-level files of the repo (README first), read from the corpus."""
+        if not corpus.paths:
+            return ""
+        repo_root = repo_root or os.path.commonpath([os.path.dirname(p) for p in corpus.paths])
+
+        top_level = [
+            i for i, path in enumerate(corpus.paths)
+            if os.path.dirname(os.path.relpath(path, repo_root)) == ""
+        ]
+        top_level.sort(key=lambda i: not os.path.basename(corpus.paths[i]).lower().startswith("readme"))
+
+        parts, size = [], 0
+        for i in top_level:
+            start = corpus.file_starts[i]
+            end = min(corpus.file_ends[i], start + self.CONTEXT_FILE_CHARS)
+            part = f"File: {os.path.relpath(corpus.paths[i], repo_root)}\n{corpus.read(start, end)}"
+            parts.append(part)
+            size += len(part)
+            if size >= self.CONTEXT_MAX_CHARS:
+                break
+
+        # No top-level source files: fall back to the start of the corpus
+        if not parts and len(corpus):
+            parts.append(corpus.chunk(0).page_content)
+        return "\n\n".join(parts)[:self.CONTEXT_MAX_CHARS]
+
+    def _section_prompt(self, title: str, context: str, snippets: str) -> str:
+        if title == "Overview":
+            return f"""
+You are a professional documentation writer.
+
+TOP-LEVEL PROJECT FILES:
+{context}
+
+Write the opening of a README.md: a "# <project name>" title line followed by a
+short description paragraph. Output only that markdown.
+"""
+
+        return f"""
+You are a professional documentation writer.
+
+TOP-LEVEL PROJECT FILES:
+{context}
+
+RELEVANT CODE:
+{snippets}
+
+Write only the "## {title}" section of the project's README.md, based on the code
+above. Be concrete: real commands, file names, endpoints and options.
+If the code shows nothing relevant to this section, reply with exactly: SKIP
+"""
+
     # ------------------------------------------------------------
     # 🧠 STANDARD README GENERATION
     # ------------------------------------------------------------
@@ -91,7 +331,7 @@ Write full markdown output now.
         if not isinstance(summary, str):
             summary = str(summary)
 
-        if len(summary) > 2000:
+        if len(summary) > self.CONDENSE_THRESHOLD:
             print("Summary large → condensing")
             summary = self._condense_summary(llm, summary)
 
@@ -139,7 +379,10 @@ Produce a complete README.md including:
     def _condense_summary(self, llm, text):
         docs = [Document(page_content=text)]
 
-        splitter = RecursiveCharacterTextSplitter(chunk_size=600, chunk_overlap=100)
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.CONDENSE_CHUNK_SIZE,
+            chunk_overlap=self.CONDENSE_CHUNK_OVERLAP
+        )
         split_docs = splitter.split_documents(docs)
 
         map_prompt = PromptTemplate(
@@ -68,45 +68,39 @@
 #             model=self.embedding_model
 #         )
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
+from llm_providers import get_provider
 import os
 
 load_dotenv()
 
 class GitReadmeBrain:
     """
-    🚀 Gemini-Powered Brain
-    Replaces OpenAI completely.
+    🚀 Provider-Agnostic Brain
+    Gemini by default; LLM_PROVIDER / EMBEDDING_PROVIDER switch to
+    "openai_compatible" or the offline "fake" provider (see llm_providers.py).
     """
 
     def __init__(self):
 
-        # === GEMINI KEYS ===
-        self.gemini_api_key = os.getenv("GEMINI_API_KEY")
+        # === PROVIDERS ===
+        self.provider_name = os.getenv("LLM_PROVIDER", "gemini")
+        self.embedding_provider_name = os.getenv("EMBEDDING_PROVIDER", self.provider_name)
 
-        if not self.gemini_api_key:
-            raise Exception("❌ GEMINI_API_KEY missing in .env")
-
-        # === MODEL NAMES ===
-        self.model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")  # free+fast
-        self.embedding_model = os.getenv("GEMINI_EMBED_MODEL", "text-embedding-004")
+        self.provider = get_provider(self.provider_name)
+        self.embedding_provider = (
+            self.provider
+            if self.embedding_provider_name == self.provider_name
+            else get_provider(self.embedding_provider_name)
+        )
 
     # ───────────────────────────────────────────────────────────────
-    #  Gemini LLM (main text generator)
+    #  LLM (main text generator)
     # ───────────────────────────────────────────────────────────────
     def getLLM(self, max_tokens=2000, temperature=0.4):
-        return ChatGoogleGenerativeAI(
-            model=self.model,
-            google_api_key=self.gemini_api_key,
-            temperature=temperature,
-            max_output_tokens=max_tokens
-        )
+        return self.provider.get_llm(max_tokens=max_tokens, temperature=temperature)
 
     # ───────────────────────────────────────────────────────────────
-    # Gemini Embedding Model (vector search)
+    # Embedding Model (vector search)
     # ───────────────────────────────────────────────────────────────
     def getEmbeddingModel(self):
-        return GoogleGenerativeAIEmbeddings(
-            model=self.embedding_model,
-            google_api_key=self.gemini_api_key
-        )
+        return self.embedding_provider.get_embeddings()
@@ -3,6 +3,8 @@ import shutil
 from git import Repo
 import logging
 
+from corpus import CorpusStore
+
 # ------------------------------------------------------------
 # Logging Setup for GitReadme
 # ------------------------------------------------------------
@@ -15,6 +17,24 @@ logger = logging.getLogger("GitReadmeHelper")
 
 class Helper:
 
+    # Source extensions that identify a repo's main language
+    LANGUAGE_BY_EXTENSION = {
+        ".py": "python", ".js": "javascript", ".ts": "typescript",
+        ".java": "java", ".c": "c", ".cpp": "cpp", ".go": "go",
+        ".rs": "rust", ".rb": "ruby", ".php": "php", ".sh": "shell"
+    }
+
+    # Clones and job workspaces live under this folder
+    PROJECTS_DIR = "projects"
+
+    # Text/code file types read from a repo (everything else is skipped)
+    ALLOWED_EXTENSIONS = {
+        ".py", ".md", ".txt", ".json", ".yaml", ".yml", ".csv",
+        ".ini", ".cfg", ".xml", ".html", ".js", ".css",
+        ".java", ".c", ".cpp", ".ts", ".go", ".rs",
+        ".rb", ".php", ".sh", ".bat"
+    }
+
     # ------------------------------------------------------------
     # Extract text/code files recursively from a cloned repo
     # ------------------------------------------------------------
@@ -24,12 +44,6 @@ class Helper:
         Returns a giant string with "File: <filepath>" headers.
         """
         code_text = ""
-        allowed_extensions = {
-            ".py", ".md", ".txt", ".json", ".yaml", ".yml", ".csv",
-            ".ini", ".cfg", ".xml", ".html", ".js", ".css",
-            ".java", ".c", ".cpp", ".ts", ".go", ".rs",
-            ".rb", ".php", ".sh", ".bat"
-        }
 
         for root, _, files in os.walk(folder_name):
             for file in files:
@@ -38,7 +52,7 @@ class Helper:
                     _, ext = os.path.splitext(file)
 
                     # Skip binary / unknown file types
-                    if ext.lower() not in allowed_extensions:
+                    if ext.lower() not in self.ALLOWED_EXTENSIONS:
                         continue
 
                     with open(path, "r", encoding="utf-8") as f:
@@ -51,6 +65,37 @@ class Helper:
 
         return code_text
 
+    # ------------------------------------------------------------
+    # Extract into a memory-mapped corpus (no giant in-memory string)
+    # ------------------------------------------------------------
+    def extract_corpus_from_repo(self, folder_name: str, corpus_path: str,
+                                 chunk_size: int, chunk_overlap: int) -> CorpusStore:
+        """
+        Same file selection as extract_code_from_repo, but streamed into one
+        memory-mapped file with a per-file and per-chunk offset index.
+        """
+        corpus = CorpusStore.build(
+            folder_name, corpus_path, self.ALLOWED_EXTENSIONS, chunk_size, chunk_overlap
+        )
+        logger.info(f"Corpus built: {corpus.file_count} files, {len(corpus)} chunks, "
+                    f"{corpus.text_length} bytes → {corpus_path}")
+        return corpus
+
+    # ------------------------------------------------------------
+    # Detect the dominant language of an extracted corpus
+    # ------------------------------------------------------------
+    def detect_language(self, corpus):
+        """
+        Language with the most source bytes in the corpus, or None when the
+        repo has no recognised source files (docs / config only).
+        """
+        totals = {}
+        for path, start, end in zip(corpus.paths, corpus.file_starts, corpus.file_ends):
+            language = self.LANGUAGE_BY_EXTENSION.get(os.path.splitext(path)[1].lower())
+            if language:
+                totals[language] = totals.get(language, 0) + (end - start)
+        return max(totals, key=totals.get) if totals else None
+
     # ------------------------------------------------------------
     # Clone GitHub repo into /projects/<repo_name>
     # ------------------------------------------------------------
@@ -60,7 +105,7 @@ class Helper:
         Returns the full path.
         """
 
-        projects_dir = "projects"
+        projects_dir = self.PROJECTS_DIR
         if not os.path.exists(projects_dir):
             os.makedirs(projects_dir)
             logger.info(f"Created directory: {projects_dir}")
@@ -0,0 +1,253 @@
+"""
+LLM / embedding provider registry for GitReadme.
+
+Providers are selected with LLM_PROVIDER (and optionally EMBEDDING_PROVIDER):
+- gemini             Google Gemini (default, needs GEMINI_API_KEY)
+- openai_compatible  Any OpenAI-compatible server (vLLM, llama.cpp, Ollama, LM Studio...)
+- fake               Deterministic local fake for load testing, no network or quota
+"""
+
+import hashlib
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import SimpleChatModel
+from langchain_core.messages import BaseMessage
+from pydantic import PrivateAttr
+
+PROVIDERS = {}
+
+
+def register_provider(name: str):
+    """Class decorator adding a provider to the registry under `name`."""
+    def decorator(cls):
+        PROVIDERS[name] = cls
+        return cls
+    return decorator
+
+
+def get_provider(name: str):
+    """Instantiate the provider registered under `name`."""
+    try:
+        provider_cls = PROVIDERS[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown LLM provider '{name}'. Available: {', '.join(sorted(PROVIDERS))}"
+        )
+    return provider_cls()
+
+
+# ───────────────────────────────────────────────────────────────
+#  Gemini
+# ───────────────────────────────────────────────────────────────
+@register_provider("gemini")
+class GeminiProvider:
+
+    def __init__(self):
+        self.api_key = os.getenv("GEMINI_API_KEY")
+
+        if not self.api_key:
+            raise Exception("❌ GEMINI_API_KEY missing in .env")
+
+        self.model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")  # free+fast
+        self.embedding_model = os.getenv("GEMINI_EMBED_MODEL", "text-embedding-004")
+
+    def get_llm(self, max_tokens, temperature):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(
+            model=self.model,
+            google_api_key=self.api_key,
+            temperature=temperature,
+            max_output_tokens=max_tokens
+        )
+
+    def get_embeddings(self):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        return GoogleGenerativeAIEmbeddings(
+            model=self.embedding_model,
+            google_api_key=self.api_key
+        )
+
+
+# ───────────────────────────────────────────────────────────────
+#  OpenAI-compatible local servers
+# ───────────────────────────────────────────────────────────────
+@register_provider("openai_compatible")
+class OpenAICompatibleProvider:
+
+    def __init__(self):
+        self.base_url = os.getenv("OPENAI_BASE_URL", "http://localhost:8080/v1")
+        # Local servers usually ignore the key, but the client requires one
+        self.api_key = os.getenv("OPENAI_API_KEY", "not-needed")
+        self.model = os.getenv("OPENAI_MODEL", "local-model")
+        self.embedding_model = os.getenv("OPENAI_EMBED_MODEL", self.model)
+
+    def _client_module(self):
+        try:
+            import langchain_openai
+        except ImportError:
+            raise Exception(
+                "❌ LLM_PROVIDER=openai_compatible needs `pip install langchain-openai`"
+            )
+        return langchain_openai
+
+    def get_llm(self, max_tokens, temperature):
+        return self._client_module().ChatOpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+
+    def get_embeddings(self):
+        return self._client_module().OpenAIEmbeddings(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            model=self.embedding_model,
+            # Local servers take raw strings, not tiktoken ids
+            check_embedding_ctx_length=False
+        )
+
+
+# ───────────────────────────────────────────────────────────────
+#  Deterministic fake (load testing / benchmarks)
+# ───────────────────────────────────────────────────────────────
+class FakeLLMError(Exception):
+    """Error injected by the fake provider to simulate upstream failures."""
+
+
+class FakeChatModel(SimpleChatModel):
+    """
+    Chat model that sleeps for a sampled latency, fails at a configurable rate,
+    and answers with text derived deterministically from the prompt.
+    """
+
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    latency_distribution: str = "constant"
+    error_rate: float = 0.0
+    output_words: int = 100
+    seed: int = 0
+
+    _rng: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "gitreadme-fake"
+
+    def get_num_tokens(self, text: str) -> int:
+        # Used by the reduce step; avoids the default transformers tokenizer
+        return math.ceil(len(text) / 4)
+
+    def sample_latency_ms(self) -> float:
+        """Draw one latency from the configured distribution."""
+        mean, jitter = self.latency_ms, self.latency_jitter_ms
+        with self._lock:
+            if self.latency_distribution == "uniform":
+                value = self._rng.uniform(mean - jitter, mean + jitter)
+            elif self.latency_distribution == "normal":
+                value = self._rng.gauss(mean, jitter)
+            elif self.latency_distribution == "lognormal":
+                # `latency_ms` is the median, `jitter / latency` the log-space sigma
+                sigma = jitter / mean if mean > 0 else 0.0
+                value = self._rng.lognormvariate(math.log(mean), sigma) if mean > 0 else 0.0
+            elif self.latency_distribution == "exponential":
+                value = self._rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+            else:
+                value = mean
+        return max(0.0, value)
+
+    def _call(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+
+        time.sleep(self.sample_latency_ms() / 1000.0)
+
+        with self._lock:
+            failed = self._rng.random() < self.error_rate
+        if failed:
+            raise FakeLLMError("Fake provider injected error (503 Service Unavailable)")
+
+        return self.respond(prompt)
+
+    def respond(self, prompt: str) -> str:
+        """Deterministic answer: the same prompt always gives the same text."""
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        words = re.findall(r"[A-Za-z_][A-Za-z0-9_]{2,}", prompt) or ["empty"]
+        picker = random.Random(digest)
+        body = " ".join(picker.choice(words) for _ in range(self.output_words))
+        return f"Summary {digest[:12]}: {body}"
+
+
+class HashedEmbeddings(Embeddings):
+    """
+    Deterministic embeddings using the hashing trick: each token is hashed into
+    one of `dim` signed buckets and the vector is L2-normalised.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for token in re.findall(r"\w+", text.lower()):
+            h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+            vector[h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            return vector
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+@register_provider("fake")
+class FakeProvider:
+
+    def __init__(self):
+        self.latency_ms = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+        self.latency_jitter_ms = float(os.getenv("FAKE_LLM_LATENCY_JITTER_MS", "0"))
+        # constant | uniform | normal | lognormal | exponential
+        self.latency_distribution = os.getenv("FAKE_LLM_LATENCY_DIST", "constant").lower()
+        self.error_rate = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+        self.output_words = int(os.getenv("FAKE_LLM_OUTPUT_WORDS", "100"))
+        self.seed = int(os.getenv("FAKE_LLM_SEED", "0"))
+        self.embedding_dim = int(os.getenv("FAKE_EMBED_DIM", "256"))
+
+    def get_llm(self, max_tokens, temperature):
+        return FakeChatModel(
+            latency_ms=self.latency_ms,
+            latency_jitter_ms=self.latency_jitter_ms,
+            latency_distribution=self.latency_distribution,
+            error_rate=self.error_rate,
+            # Roughly 4 chars per token, 5 chars per word
+            output_words=min(self.output_words, max(1, int(max_tokens * 0.75))),
+            seed=self.seed
+        )
+
+    def get_embeddings(self):
+        return HashedEmbeddings(dim=self.embedding_dim)
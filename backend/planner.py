@@ -0,0 +1,295 @@
+import math
+import os
+import logging
+
+from generators import Generators
+
+logger = logging.getLogger("GitReadmePlanner")
+
+
+class BudgetExceededError(ValueError):
+    """Raised when a generation plan is over the configured limits."""
+
+    def __init__(self, message: str, plan: dict):
+        super().__init__(message)
+        self.plan = plan
+
+
+class GenerationPlanner:
+    """
+    Predicts what a README generation will cost before any LLM call is made.
+
+    Token counts are estimated locally from character counts, and the map-reduce
+    shape mirrors Generators so chunk and call counts line up with a real run.
+    """
+
+    # LangChain's ReduceDocumentsChain collapses map outputs above this many tokens
+    REDUCE_TOKEN_MAX = 3000
+
+    # Prompt text wrapped around each chunk / summary by the chains
+    PROMPT_OVERHEAD_TOKENS = 60
+
+    def __init__(self):
+        self.chars_per_token = float(os.getenv("GITREADME_CHARS_PER_TOKEN", "4"))
+        self.map_output_tokens = int(os.getenv("GITREADME_MAP_OUTPUT_TOKENS", "150"))
+        self.summary_tokens = int(os.getenv("GITREADME_SUMMARY_TOKENS", "400"))
+        self.seconds_per_call = float(os.getenv("GITREADME_SECONDS_PER_CALL", "2.0"))
+        self.concurrency = max(1, int(os.getenv("GITREADME_LLM_CONCURRENCY", "4")))
+        self.seconds_per_embedding_call = float(os.getenv("GITREADME_SECONDS_PER_EMBEDDING_CALL", "0.5"))
+        self.embed_window = max(1, int(os.getenv("GITREADME_MAP_WINDOW", "32")))
+        self.section_top_k = int(os.getenv("GITREADME_SECTION_TOP_K", "4"))
+
+        # === LIMITS ===
+        self.max_input_tokens = int(os.getenv("GITREADME_MAX_INPUT_TOKENS", "1000000"))
+        self.max_llm_calls = int(os.getenv("GITREADME_MAX_LLM_CALLS", "400"))
+        self.context_window_tokens = int(os.getenv("GITREADME_CONTEXT_WINDOW", "1000000"))
+
+        # "reject" fails the request, "degrade" trims the input until it fits
+        self.policy = os.getenv("GITREADME_BUDGET_POLICY", "degrade").lower()
+
+    # ------------------------------------------------------------
+    # Token estimation
+    # ------------------------------------------------------------
+    def estimate_tokens(self, text_or_length) -> int:
+        """Approximate token count from a string or a character count."""
+        length = text_or_length if isinstance(text_or_length, int) else len(text_or_length)
+        return math.ceil(length / self.chars_per_token)
+
+    def estimate_chunks(self, length: int, chunk_size: int = Generators.CHUNK_SIZE,
+                        overlap: int = Generators.CHUNK_OVERLAP) -> int:
+        """Chunk count the recursive splitter will produce (lower bound)."""
+        if length <= 0:
+            return 0
+        if length <= chunk_size:
+            return 1
+        return math.ceil((length - overlap) / (chunk_size - overlap))
+
+    # ------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------
+    def plan(self, text_length: int, generation_method: str = "Standard README",
+             chunks: int = None) -> dict:
+        """
+        Build a plan for a text of `text_length` characters.
+        `chunks` overrides the estimate when the exact count is known (CorpusStore).
+        Returns a dict with chunk / call / token counts and a latency estimate.
+        """
+        input_tokens = self.estimate_tokens(text_length)
+        if chunks is None:
+            chunks = self.estimate_chunks(text_length)
+        retrieval = generation_method == "README with Code Retrieval"
+
+        map_calls = map_rounds = reduce_calls = reduce_rounds = condense_calls = 0
+        pending = 0
+        if not retrieval:
+            # Map step: one call per chunk, run in batches of `concurrency`
+            map_calls = chunks
+            map_rounds = math.ceil(map_calls / self.concurrency)
+
+            # Reduce step: collapse map outputs until they fit token_max, then combine
+            pending = map_calls * self.map_output_tokens
+            while pending > self.REDUCE_TOKEN_MAX:
+                groups = math.ceil(pending / self.REDUCE_TOKEN_MAX)
+                reduce_calls += groups
+                reduce_rounds += groups
+                pending = groups * self.map_output_tokens
+            if chunks:
+                reduce_calls += 1
+                reduce_rounds += 1
+
+            # README step: optional condense of the summary before the final prompt
+            summary_chars = int(self.summary_tokens * self.chars_per_token)
+            threshold = (
+                Generators.EXAMPLES_CONDENSE_THRESHOLD
+                if generation_method == "README with Examples"
+                else Generators.CONDENSE_THRESHOLD
+            )
+            if summary_chars > threshold:
+                condense_calls = self.estimate_chunks(
+                    summary_chars,
+                    Generators.CONDENSE_CHUNK_SIZE,
+                    Generators.CONDENSE_CHUNK_OVERLAP
+                ) + 1
+
+        # Retrieval generation skips the summary and writes every section in its own parallel call
+        final_calls = len(Generators.README_SECTIONS) if retrieval else 1
+
+        # Embedding calls: the code index is embedded one map window per call,
+        # plus one call for the section queries; examples need one query embedding
+        if retrieval:
+            embedding_calls = math.ceil(chunks / self.embed_window) + 1 if chunks else 0
+        else:
+            embedding_calls = 1 if generation_method == "README with Examples" else 0
+
+        llm_calls = map_calls + reduce_calls + condense_calls + final_calls
+        latency_rounds = (
+            map_rounds + reduce_rounds
+            + (math.ceil((condense_calls - 1) / self.concurrency) + 1 if condense_calls else 0)
+            + math.ceil(final_calls / self.concurrency)
+        )
+        latency_seconds = (
+            latency_rounds * self.seconds_per_call
+            + embedding_calls * self.seconds_per_embedding_call
+        )
+
+        chunk_tokens = self.estimate_tokens(min(text_length, Generators.CHUNK_SIZE))
+        if retrieval:
+            # Project context + top-k code chunks per section
+            section_tokens = self.PROMPT_OVERHEAD_TOKENS + self.estimate_tokens(
+                min(text_length, Generators.CONTEXT_MAX_CHARS + self.section_top_k * Generators.CHUNK_SIZE)
+            )
+            largest_prompt_tokens = section_tokens
+            prompt_tokens = final_calls * section_tokens
+        else:
+            largest_prompt_tokens = self.PROMPT_OVERHEAD_TOKENS + max(
+                chunk_tokens,
+                min(pending if chunks else 0, self.REDUCE_TOKEN_MAX),
+                self.summary_tokens
+            )
+            prompt_tokens = (
+                input_tokens
+                + llm_calls * self.PROMPT_OVERHEAD_TOKENS
+                + map_calls * self.map_output_tokens
+            )
+
+        return {
+            "generation_method": generation_method,
+            "input_chars": text_length,
+            "input_tokens": input_tokens,
+            "chunks": chunks,
+            "map_calls": map_calls,
+            "reduce_calls": reduce_calls,
+            "condense_calls": condense_calls,
+            "final_calls": final_calls,
+            "llm_calls": llm_calls,
+            "embedding_calls": embedding_calls,
+            "estimated_prompt_tokens": prompt_tokens,
+            "largest_prompt_tokens": largest_prompt_tokens,
+            "estimated_latency_seconds": round(latency_seconds, 2),
+            "violations": self._violations(input_tokens, llm_calls, largest_prompt_tokens),
+            "degraded": False,
+        }
+
+    def plan_hierarchical(self, plan: dict, summarizer, repo_path: str) -> dict:
+        """
+        `plan` with its map-reduce calls replaced by what `summarizer`
+        (a HierarchicalSummarizer) would make for the repo at `repo_path`:
+        one call per uncached file (plus chunk calls for large files) and the
+        reduce calls of every uncached directory, batched one tree level at a time.
+        """
+        counts = summarizer.estimate_calls(
+            repo_path, int(self.map_output_tokens * self.chars_per_token)
+        )
+        llm_calls = (
+            counts["file_calls"] + counts["directory_calls"]
+            + plan["condense_calls"] + plan["final_calls"]
+        )
+
+        # Each file window and each directory level is one batch per pass
+        latency_rounds = (
+            sum(math.ceil(batch / self.concurrency) for batch in counts["file_batches"])
+            + sum(math.ceil(batch / self.concurrency) for batch in counts["directory_batches"])
+            + (math.ceil((plan["condense_calls"] - 1) / self.concurrency) + 1 if plan["condense_calls"] else 0)
+            + math.ceil(plan["final_calls"] / self.concurrency)
+        )
+        largest_prompt_tokens = self.PROMPT_OVERHEAD_TOKENS + max(
+            self.estimate_tokens(min(plan["input_chars"], Generators.CHUNK_SIZE)),
+            self.estimate_tokens(summarizer.MAX_REDUCE_CHARS),
+            self.summary_tokens
+        )
+
+        return dict(
+            plan,
+            summarizer="hierarchical",
+            map_calls=counts["file_calls"],
+            reduce_calls=counts["directory_calls"],
+            cached_summaries=counts["cached"],
+            llm_calls=llm_calls,
+            estimated_prompt_tokens=plan["input_tokens"]
+                + llm_calls * self.PROMPT_OVERHEAD_TOKENS
+                + counts["file_calls"] * self.map_output_tokens,
+            largest_prompt_tokens=largest_prompt_tokens,
+            estimated_latency_seconds=round(
+                latency_rounds * self.seconds_per_call
+                + plan["embedding_calls"] * self.seconds_per_embedding_call, 2
+            ),
+            violations=self._violations(plan["input_tokens"], llm_calls, largest_prompt_tokens),
+        )
+
+    def _violations(self, input_tokens: int, llm_calls: int, largest_prompt_tokens: int) -> list:
+        violations = []
+        if input_tokens > self.max_input_tokens:
+            violations.append(
+                f"input_tokens {input_tokens} > GITREADME_MAX_INPUT_TOKENS {self.max_input_tokens}"
+            )
+        if llm_calls > self.max_llm_calls:
+            violations.append(
+                f"llm_calls {llm_calls} > GITREADME_MAX_LLM_CALLS {self.max_llm_calls}"
+            )
+        if largest_prompt_tokens > self.context_window_tokens:
+            violations.append(
+                f"largest_prompt_tokens {largest_prompt_tokens} > GITREADME_CONTEXT_WINDOW "
+                f"{self.context_window_tokens}"
+            )
+        return violations
+
+    # ------------------------------------------------------------
+    # Enforcement
+    # ------------------------------------------------------------
+    def enforce_corpus(self, corpus, generation_method: str = "Standard README"):
+        """
+        Check a CorpusStore against the limits before any LLM call.
+        Returns (corpus, plan); when the policy is "degrade" the corpus is cut
+        to its leading chunks that fit. Raises BudgetExceededError when the
+        policy is "reject" or trimming cannot help.
+        """
+        plan = self._check(self.plan(corpus.text_length, generation_method, chunks=len(corpus)))
+        if not plan["violations"]:
+            return corpus, plan
+
+        # Exact chunk counts are known, so cap on chunks as well as on size
+        max_bytes = int(self.max_input_tokens * self.chars_per_token)
+        max_chunks = self._max_chunks(generation_method, len(corpus))
+        if max_chunks:
+            max_bytes = min(max_bytes, corpus.chunk_ends[max_chunks - 1] - corpus.chunk_starts[0])
+        trimmed = corpus.truncated(max_bytes if max_chunks else 0)
+        return trimmed, self._degraded(
+            plan,
+            self.plan(trimmed.text_length, generation_method, chunks=len(trimmed)),
+            len(trimmed)
+        )
+
+    def _check(self, plan: dict) -> dict:
+        if plan["violations"] and self.policy != "degrade":
+            raise BudgetExceededError(
+                "Repository exceeds generation budget: " + "; ".join(plan["violations"]),
+                plan
+            )
+        return plan
+
+    def _degraded(self, plan: dict, degraded_plan: dict, remaining: int) -> dict:
+        if not remaining or degraded_plan["violations"]:
+            raise BudgetExceededError(
+                "Repository exceeds generation budget even after trimming: "
+                + "; ".join(degraded_plan["violations"] or plan["violations"]),
+                degraded_plan
+            )
+
+        logger.warning(
+            f"Input trimmed from {plan['input_chars']} to {degraded_plan['input_chars']} chars "
+            f"to fit budget ({'; '.join(plan['violations'])})"
+        )
+        degraded_plan["degraded"] = True
+        degraded_plan["original_input_chars"] = plan["input_chars"]
+        return degraded_plan
+
+    def _max_chunks(self, generation_method: str, available: int) -> int:
+        """Largest chunk count whose plan stays within the call limit."""
+        low, high = 0, available
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.plan(0, generation_method, chunks=mid)["llm_calls"] <= self.max_llm_calls:
+                low = mid
+            else:
+                high = mid - 1
+        return low
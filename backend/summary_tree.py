@@ -0,0 +1,379 @@
+import hashlib
+import logging
+import os
+import re
+
+from git import Repo
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from generators import Generators
+from helpers import Helper
+
+logger = logging.getLogger("GitReadmeSummaryTree")
+
+
+class SummaryStore:
+    """
+    Content-addressed summary cache on disk: one small file per key.
+    Keys are derived from git object hashes and the namespace from the model
+    and prompts that wrote them (see HierarchicalSummarizer.cache_namespace),
+    so entries never go stale.
+    """
+
+    def __init__(self, root: str = None, namespace: str = "v1"):
+        self.root = os.path.join(
+            root or os.getenv("GITREADME_SUMMARY_CACHE", "summary_cache"),
+            namespace
+        )
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, summary: str):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write-then-rename so concurrent jobs never read a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(summary)
+        os.replace(tmp_path, path)
+
+
+class HierarchicalSummarizer:
+    """
+    Summarizes a repo bottom-up: files, then directories, then the root.
+
+    Every directory summary is stored under its git tree hash and every file
+    summary under its blob hash, so on a new commit only the directories on the
+    path to a changed file are re-summarized. Each reduce prompt is capped at
+    MAX_REDUCE_CHARS, so no single call grows with the size of the repo.
+    """
+
+    MAX_REDUCE_CHARS = 6000
+    MAX_PART_CHARS = 1500
+    MAX_FILE_CHARS = 100_000
+
+    # Bump when summaries should be regenerated for reasons the prompt text doesn't show
+    PROMPT_VERSION = "1"
+
+    FILE_PROMPT = (
+        "Summarize what this source file does in 2-4 sentences: its purpose, "
+        "key functions or classes, and notable dependencies.\n\n"
+        "File: {name}\n\n{content}\n\nSUMMARY:"
+    )
+    DIRECTORY_PROMPT = (
+        "Below are summaries of the files and sub-directories inside one directory "
+        "of a code repository. Write a concise summary of what this directory "
+        "provides as a whole.\n\n{parts}\n\nDIRECTORY SUMMARY:"
+    )
+    ROOT_PROMPT = (
+        "Below are summaries of the top-level files and directories of a code "
+        "repository. Write a technical overview of the whole project: purpose, "
+        "architecture, main components, and how they fit together.\n\n{parts}\n\nPROJECT SUMMARY:"
+    )
+
+    def __init__(self, store: SummaryStore = None, max_concurrency: int = None,
+                 provider: str = "", model: str = ""):
+        self.store = store or SummaryStore(namespace=self.cache_namespace(provider, model))
+        self.max_concurrency = max_concurrency or int(os.getenv("GITREADME_LLM_CONCURRENCY", "4"))
+        self.window = int(os.getenv("GITREADME_MAP_WINDOW", "32"))
+        self.generator = Generators()
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=Generators.CHUNK_SIZE,
+            chunk_overlap=Generators.CHUNK_OVERLAP
+        )
+        self.last_stats = {}
+
+    @classmethod
+    def cache_namespace(cls, provider: str, model: str) -> str:
+        """
+        Store namespace for summaries written by `provider`/`model` with the
+        current prompts, so a model or prompt change never reuses old entries.
+        """
+        prompts = "\n".join((
+            cls.PROMPT_VERSION, cls.FILE_PROMPT, cls.DIRECTORY_PROMPT, cls.ROOT_PROMPT,
+            str(cls.MAX_REDUCE_CHARS), str(cls.MAX_PART_CHARS), str(cls.MAX_FILE_CHARS)
+        ))
+        prompt_hash = hashlib.sha1(prompts.encode("utf-8")).hexdigest()[:10]
+        name = re.sub(r"[^\w\-.]", "_", f"{provider or 'default'}-{model or 'default'}")
+        return f"{name}-p{cls.PROMPT_VERSION}-{prompt_hash}"
+
+    # ------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------
+    def summarize_repo(self, llm, repo_path: str) -> str:
+        """Return the root summary for HEAD of the git repo at `repo_path`."""
+        tree = Repo(repo_path).head.commit.tree
+        self.last_stats = {"files_summarized": 0, "dirs_summarized": 0, "cache_hits": 0}
+
+        # Pass 1: summarize every uncached file in changed directories, in parallel
+        pending = []
+        self._collect_uncached_blobs(tree, pending)
+        self._summarize_blobs(llm, pending)
+
+        # Pass 2: reduce bottom-up, one batch per tree level; unchanged directories are skipped
+        summary = self._summarize_levels(llm, tree)
+
+        logger.info(f"Hierarchical summary for {repo_path}: {self.last_stats}")
+        return summary
+
+    # ------------------------------------------------------------
+    # Call estimate (no LLM calls)
+    # ------------------------------------------------------------
+    def estimate_calls(self, repo_path: str, summary_chars: int) -> dict:
+        """
+        LLM calls `summarize_repo` would make right now, walking the same tree
+        and skipping cached entries. Summaries not written yet are assumed to be
+        `summary_chars` long when sizing the reduce groups.
+        """
+        tree = Repo(repo_path).head.commit.tree
+        counts = {
+            "file_calls": 0, "file_batches": [],
+            "directory_calls": 0, "directory_batches": [], "cached": 0
+        }
+        # Parts are prefixed with "File <name>: " / "Directory <name>/: "
+        summary_chars += 32
+
+        # Files: same windows and passes as _summarize_blobs, without storing anything
+        pending = []
+        self._collect_uncached_blobs(tree, pending)
+        for offset in range(0, len(pending), self.window):
+            chunk_counts = []
+            for blob in pending[offset:offset + self.window]:
+                if blob.size <= Generators.CHUNK_SIZE:
+                    chunk_counts.append(1)
+                    continue
+                try:
+                    content = blob.data_stream.read().decode("utf-8")[:self.MAX_FILE_CHARS]
+                except Exception:
+                    continue
+                if len(content) <= Generators.CHUNK_SIZE:
+                    chunk_counts.append(1)
+                else:
+                    chunk_counts.append(len(self.splitter.split_text(content)))
+            if not chunk_counts:
+                continue
+            batches = [sum(chunk_counts)] + self._reduce_batches(
+                [[summary_chars] * n for n in chunk_counts if n > 1]
+            )
+            counts["file_calls"] += sum(batches)
+            counts["file_batches"] += batches
+
+        # Directories: same levels and passes as _summarize_levels
+        levels, counts["cached"] = self._uncached_levels(tree)
+
+        has_summary = {}
+        for depth, level in sorted(levels.items(), reverse=True):
+            lengths = []
+            for key, (subtree, _) in level.items():
+                parts = [summary_chars for blob in subtree.blobs if self._is_source(blob)]
+                parts += [
+                    summary_chars for child in subtree.trees
+                    if has_summary.get(self._tree_key(child, False), True)
+                ]
+                has_summary[key] = bool(parts)
+                lengths.append(parts)
+            for batch in self._reduce_batches(lengths):
+                counts["directory_calls"] += batch
+                counts["directory_batches"].append(batch)
+        return counts
+
+    def _reduce_batches(self, items: list) -> list:
+        """Prompt count of each `_reduce_many` pass for items given as part lengths."""
+        batches = []
+        pending = [[min(n, self.MAX_PART_CHARS) for n in lengths] for lengths in items if lengths]
+        while pending:
+            groups = [len(self._group(lengths, lambda n: n)) for lengths in pending]
+            batches.append(sum(groups))
+            pending = [[self.MAX_PART_CHARS] * g for g in groups if g > 1]
+        return batches
+
+    # ------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------
+    def _tree_key(self, tree, is_root: bool) -> str:
+        return ("root-" if is_root else "tree-") + tree.hexsha
+
+    def _blob_key(self, blob) -> str:
+        # The prompt includes the file name, so it is part of the key
+        name_hash = hashlib.sha1(blob.name.encode("utf-8")).hexdigest()[:12]
+        return f"blob-{blob.hexsha}-{name_hash}"
+
+    def _is_source(self, blob) -> bool:
+        _, ext = os.path.splitext(blob.name)
+        return ext.lower() in Helper.ALLOWED_EXTENSIONS
+
+    # ------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------
+    def _collect_uncached_blobs(self, tree, pending: list):
+        if self.store.get(self._tree_key(tree, is_root=False)) is not None:
+            return
+        for blob in tree.blobs:
+            if self._is_source(blob) and self.store.get(self._blob_key(blob)) is None:
+                pending.append(blob)
+        for subtree in tree.trees:
+            self._collect_uncached_blobs(subtree, pending)
+
+    def _summarize_blobs(self, llm, blobs: list):
+        """
+        Summarize `blobs` `self.window` files at a time. Each window reads its
+        files, maps all their prompts (large files as chunks) in one batch and
+        reduces its large files together, so only one window of content is in
+        memory and a failed call only loses the current window on retry.
+        """
+        for offset in range(0, len(blobs), self.window):
+            prompts, owners = [], []
+            for blob, chunks in self._read_window(blobs[offset:offset + self.window]):
+                prompts += [self.FILE_PROMPT.format(name=blob.path, content=chunk) for chunk in chunks]
+                owners.append((blob, len(chunks)))
+
+            summaries, large, position = self._map(llm, prompts), [], 0
+            for blob, count in owners:
+                parts, position = summaries[position:position + count], position + count
+                if count == 1:
+                    self.store.put(self._blob_key(blob), parts[0])
+                    self.last_stats["files_summarized"] += 1
+                else:
+                    large.append((blob, parts))
+
+            # Large files: reduce their chunk summaries like a directory
+            reduced = self._reduce_many(llm, [(parts, self.DIRECTORY_PROMPT) for _, parts in large])
+            for (blob, _), summary in zip(large, reduced):
+                self.store.put(self._blob_key(blob), summary)
+                self.last_stats["files_summarized"] += 1
+
+    def _read_window(self, blobs: list):
+        """Yield (blob, chunks) for the readable files of one window."""
+        for blob in blobs:
+            try:
+                content = blob.data_stream.read().decode("utf-8")
+            except Exception as e:
+                logger.warning(f"Skipping unreadable file {blob.path}: {e}")
+                self.store.put(self._blob_key(blob), "")
+                continue
+
+            content = content[:self.MAX_FILE_CHARS]
+            if len(content) <= Generators.CHUNK_SIZE:
+                yield blob, [content]
+            else:
+                yield blob, self.splitter.split_text(content)
+
+    # ------------------------------------------------------------
+    # Directories
+    # ------------------------------------------------------------
+    def _uncached_levels(self, root) -> tuple:
+        """
+        ({depth: {key: (tree, is_root)}}, cached) for every directory without a
+        stored summary. Cached directories are counted, not descended into.
+        """
+        levels, cached, frontier, depth = {}, 0, [(root, True)], 0
+        while frontier:
+            next_frontier = []
+            for tree, is_root in frontier:
+                key = self._tree_key(tree, is_root)
+                if self.store.get(key) is not None:
+                    cached += 1
+                    continue
+                levels.setdefault(depth, {})[key] = (tree, is_root)
+                next_frontier += [(subtree, False) for subtree in tree.trees]
+            frontier, depth = next_frontier, depth + 1
+        return levels, cached
+
+    def _summarize_levels(self, llm, root) -> str:
+        """
+        Reduce every uncached directory bottom-up, one tree level at a time,
+        deepest first. All directories of a level go out in one batch per
+        reduce pass, so sequential rounds grow with depth, not directory count.
+        """
+        levels, self.last_stats["cache_hits"] = self._uncached_levels(root)
+        for depth, level in sorted(levels.items(), reverse=True):
+            # Files whose summary was evicted since collection
+            missing = [
+                blob for tree, _ in level.values() for blob in tree.blobs
+                if self._is_source(blob) and self.store.get(self._blob_key(blob)) is None
+            ]
+            self._summarize_blobs(llm, missing)
+
+            items = [
+                (self._tree_parts(tree), self.ROOT_PROMPT if is_root else self.DIRECTORY_PROMPT)
+                for tree, is_root in level.values()
+            ]
+            for key, summary in zip(level, self._reduce_many(llm, items)):
+                self.store.put(key, summary)
+                self.last_stats["dirs_summarized"] += 1
+
+        return self.store.get(self._tree_key(root, is_root=True)) or ""
+
+    def _tree_parts(self, tree) -> list:
+        """Reduce inputs of one directory; children are already in the store."""
+        parts = []
+        for blob in tree.blobs:
+            if self._is_source(blob):
+                summary = self.store.get(self._blob_key(blob))
+                if summary:
+                    parts.append(f"File {blob.name}: {summary}")
+        for subtree in tree.trees:
+            summary = self.store.get(self._tree_key(subtree, is_root=False))
+            if summary:
+                parts.append(f"Directory {subtree.name}/: {summary}")
+        return parts
+
+    # ------------------------------------------------------------
+    # LLM calls
+    # ------------------------------------------------------------
+    def _map(self, llm, prompts: list) -> list:
+        if not prompts:
+            return []
+        results = llm.batch(prompts, config={"max_concurrency": self.max_concurrency})
+        return [self.generator._to_text(r) for r in results]
+
+    def _reduce_many(self, llm, items: list) -> list:
+        """
+        Combine the parts of many (parts, prompt) items with prompts that never
+        exceed MAX_REDUCE_CHARS; each pass sends the prompts of every unfinished
+        item in one batch. Items with too many parts for one prompt are
+        summarized in groups first, then combined.
+        """
+        results = ["" for _ in items]
+        pending = {i: [p[:self.MAX_PART_CHARS] for p in parts] for i, (parts, _) in enumerate(items) if parts}
+
+        while pending:
+            prompts, owners = [], []
+            for i, parts in pending.items():
+                groups = self._group(parts, len)
+                if len(groups) == 1:
+                    prompts.append(items[i][1].format(parts="\n\n".join(groups[0])))
+                    owners.append((i, True))
+                else:
+                    prompts += [self.DIRECTORY_PROMPT.format(parts="\n\n".join(g)) for g in groups]
+                    owners += [(i, False)] * len(groups)
+
+            pending = {}
+            for (i, final), output in zip(owners, self._map(llm, prompts)):
+                if final:
+                    results[i] = output
+                else:
+                    pending.setdefault(i, []).append(output[:self.MAX_PART_CHARS])
+        return results
+
+    def _group(self, parts: list, size_of) -> list:
+        """Pack consecutive parts into groups of at most MAX_REDUCE_CHARS."""
+        groups, current, size = [], [], 0
+        for part in parts:
+            if current and size + size_of(part) > self.MAX_REDUCE_CHARS:
+                groups.append(current)
+                current, size = [], 0
+            current.append(part)
+            size += size_of(part) + 2
+        groups.append(current)
+        return groups
@@ -11,6 +11,7 @@ kubectl delete -f frontend-service.yaml -n gitrot --ignore-not-found=true
 kubectl delete -f frontend-deployment.yaml -n gitrot --ignore-not-found=true
 kubectl delete -f backend-service.yaml -n gitrot --ignore-not-found=true
 kubectl delete -f backend-deployment.yaml -n gitrot --ignore-not-found=true
+kubectl delete -f backend-examples-index-pvc.yaml -n gitrot --ignore-not-found=true
 
 # Delete namespace (this removes everything)
 kubectl delete -f namespace.yaml --ignore-not-found=true
@@ -30,6 +30,7 @@ kubectl apply -f namespace.yaml
 
 # Deploy backend
 echo "🔧 Deploying backend..."
+kubectl apply -f backend-examples-index-pvc.yaml -n gitrot
 kubectl apply -f backend-deployment.yaml -n gitrot
 kubectl apply -f backend-service.yaml -n gitrot
 
@@ -18,6 +18,11 @@ cd backend
 pip install -r requirements.txt
 cd ..
 
+echo [Backend] Building examples index...
+cd backend
+python -m examples_index build
+cd ..
+
 echo [Backend] Starting FastAPI...
 start cmd /k "call venv\Scripts\activate && cd backend && uvicorn fastapi_app:app --reload"
 